@@ -0,0 +1,19 @@
+import numpy as np
+
+
+def action_mask(floor, num_floors, out=None):
+    """
+    Valid actions of cars at `floor` (an int array of any shape, e.g. `[num_elevators]` or
+    `VectorBuilding.floor`), as a bool array of shape `floor.shape + (3,)` in action order
+    (idle, up, down).
+
+    Idle is always valid. `Elevator.move_up` does nothing at the top floor and `move_down`
+    nothing at floor 0, so those moves are masked out there.
+    """
+    floor = np.asarray(floor)
+    if out is None:
+        out = np.empty(floor.shape + (3,), dtype=bool)
+    out[..., 0] = True
+    np.less(floor, num_floors - 1, out=out[..., 1])
+    np.greater(floor, 0, out=out[..., 2])
+    return out
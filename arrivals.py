@@ -0,0 +1,158 @@
+import copy
+
+import numpy as np
+
+
+class PoissonArrivals:
+    """
+    Pre-drawn non-homogeneous Poisson arrival process for a `Building`.
+
+    The arrival rate (people per unit of sim time) is piecewise constant over
+    slots of `slot_length`, cycling through `rates` (e.g. 7 per-day rates with
+    `slot_length=day_delay`, or 7*24 per-hour rates with `slot_length=day_delay/24`).
+    Arrival times come from unit-rate exponential inter-arrival times mapped
+    through the inverse cumulative rate, and origin/destination pairs are drawn
+    from `od_matrix` (uniform over distinct floors by default). Everything is
+    drawn in NumPy, `horizon` sim time at a time, and `pop_until` hands every
+    arrival of a tick window over in one batch.
+    """
+
+    def __init__(
+            self,
+            num_floors: int,
+            rates: list[float],
+            slot_length: float,
+            od_matrix=None,
+            start_slot: int = 0,
+            horizon: float = 1000.0,
+            seed: int | None = None
+    ):
+
+        self.num_floors = num_floors
+        self.rates = np.asarray(rates, dtype=np.float64)
+        self.slot_length = slot_length
+        self.start_slot = start_slot
+        self.horizon = horizon
+
+        if od_matrix is None:
+            od_matrix = np.ones((num_floors, num_floors)) - np.eye(num_floors)
+        od_matrix = np.asarray(od_matrix, dtype=np.float64)
+        if od_matrix.shape != (num_floors, num_floors):
+            raise ValueError(f"od_matrix must have shape ({num_floors}, {num_floors}), got {od_matrix.shape}")
+        if np.any(np.diag(od_matrix) != 0):
+            raise ValueError("od_matrix must have a zero diagonal (origin and destination must differ)")
+        self.od_probs = od_matrix.ravel() / od_matrix.sum()
+
+        self.rng = np.random.default_rng(seed)
+        self.reset()
+
+    @classmethod
+    def from_spawn_weight(cls, num_floors, spawn_weight, day_delay, **kwargs):
+        """
+        Builds the process matching `Building.seasonality_spawn`: one arrival
+        every `spawn_weight[day]` on average, days of `day_delay`, starting on day 1.
+        """
+        rates = 1.0 / np.asarray(spawn_weight, dtype=np.float64)
+        kwargs.setdefault('start_slot', 1)
+        return cls(num_floors, rates, day_delay, **kwargs)
+
+    def reset(self):
+        """
+        Drops the pending arrivals and starts a new episode at time 0.
+        """
+        self.times = np.empty(0)
+        self.origins = np.empty(0, dtype=np.int64)
+        self.destinations = np.empty(0, dtype=np.int64)
+        self.position = 0
+        self.drawn_until = 0.0
+        self.popped_until = 0.0  # Time of the last pop_until
+
+    def get_state(self):
+        """
+        State for `Building.snapshot`: the pending arrivals and the generator state.
+        The pending arrays are only ever replaced, never written to, so they are shared, not copied.
+        """
+        return (self.times, self.origins, self.destinations, self.position, self.drawn_until, self.popped_until,
+                self.rng.bit_generator.state)
+
+    def set_state(self, state):
+        (self.times, self.origins, self.destinations, self.position, self.drawn_until, self.popped_until,
+         rng_state) = state
+        self.rng.bit_generator.state = rng_state
+
+    def fork(self, seed=None):
+        """
+        Independent copy for lookahead: the arrivals after the last `pop_until` are dropped
+        and redrawn from `seed`. The process is memoryless, so the copy's future has the same
+        distribution without revealing the real one.
+        """
+        fork = copy.copy(self)
+        fork.rng = np.random.default_rng(seed)
+        fork.times = np.empty(0)
+        fork.origins = np.empty(0, dtype=np.int64)
+        fork.destinations = np.empty(0, dtype=np.int64)
+        fork.position = 0
+        fork.drawn_until = self.popped_until
+        return fork
+
+    def _cumulative_rate(self, start, stop):
+        """
+        Slot boundaries in [start, stop] and the cumulative rate at each of them, from `start`.
+        """
+        first = int(np.floor(start / self.slot_length))
+        last = int(np.ceil(stop / self.slot_length))
+        edges = np.arange(first, last + 1) * self.slot_length
+        edges[0] = start
+        edges[-1] = stop
+        slot_rates = self.rates[(self.start_slot + np.arange(first, last)) % len(self.rates)]
+        cumulative = np.concatenate(([0.0], np.cumsum(slot_rates * np.diff(edges))))
+        return edges, cumulative
+
+    def _draw(self, stop):
+        """
+        Draws the arrivals in (drawn_until, stop] and appends them to the pending ones.
+        """
+        start = self.drawn_until
+        edges, cumulative = self._cumulative_rate(start, stop)
+        total = cumulative[-1]
+
+        # Unit-rate inter-arrival times in operational time. Disjoint chunks of a
+        # Poisson process are independent, so each chunk starts afresh at its left edge.
+        size = int(total + 4 * np.sqrt(total)) + 16
+        unit_times = np.cumsum(self.rng.exponential(size=size))
+        while unit_times[-1] <= total:
+            unit_times = np.concatenate((unit_times, unit_times[-1] + np.cumsum(self.rng.exponential(size=size))))
+        unit_times = unit_times[unit_times <= total]
+
+        times = np.interp(unit_times, cumulative, edges)
+        pairs = self.rng.choice(self.od_probs.size, size=times.size, p=self.od_probs)
+        origins, destinations = np.divmod(pairs, self.num_floors)
+
+        pending = slice(self.position, None)
+        self.times = np.concatenate((self.times[pending], times))
+        self.origins = np.concatenate((self.origins[pending], origins))
+        self.destinations = np.concatenate((self.destinations[pending], destinations))
+        self.position = 0
+        self.drawn_until = stop
+
+    def pop_until(self, time):
+        """
+        Returns the (times, origins, destinations) arrays of every arrival not
+        handed out yet whose time is <= `time`.
+        """
+        while self.drawn_until < time:
+            self._draw(max(time, self.drawn_until + self.horizon))
+
+        end = np.searchsorted(self.times, time, side='right')
+        batch = slice(self.position, end)
+        self.position = end
+        self.popped_until = max(self.popped_until, time)
+        return self.times[batch], self.origins[batch], self.destinations[batch]
+
+    def next_time(self) -> float:
+        """
+        Time of the next arrival not handed out yet.
+        """
+        while self.position == len(self.times):
+            self._draw(self.drawn_until + self.horizon)
+        return self.times[self.position]
@@ -1,76 +1,105 @@
-import pygame
-import json
 import numpy as np
 
+from action_mask import action_mask
 from building import Building
-from view import BuildingView
+from observation import ObservationWriter
 from constants import ScreenConfig
-
-with open('params.json', 'r') as f:
-    params = json.load(f)
+from sim_config import SimConfig
 
 class BaseElevatorEnv:
     """
     A base environment that contains the common logic for both the single-agent (Gym)
     and multi-agent (PettingZoo) elevator environments.
     """
-    def __init__(self, render_mode=None, sim_step_size=1.0):
-        pygame.init()
+    def __init__(self, render_mode=None, sim_step_size=1.0, config=None, compact_obs=False, decision_interval=1):
         self.render_mode = render_mode
-        self.screen = pygame.display.set_mode((ScreenConfig.WIDTH, ScreenConfig.HEIGHT)) if render_mode == "human" else pygame.Surface((ScreenConfig.WIDTH, ScreenConfig.HEIGHT))
-        self.font = pygame.font.Font(None, 24)
+        if decision_interval < 1:
+            raise ValueError(f"decision_interval must be at least 1, got {decision_interval}")
+        # Maximum number of ticks an action is repeated for (see _step_interval)
+        self.decision_interval = decision_interval
+        # A SimConfig, a params dict or a JSON path; None loads ./params.json once per process
+        self.config = SimConfig.coerce(config)
         
-        floor_height = self.screen.get_height() // (params['num_floors'] + 1)
-        
-        self.building = Building(floor_height=floor_height, **params, sim_step_size=sim_step_size)
+        self.building = Building(**self.config.building_kwargs(), sim_step_size=sim_step_size)
         
+        # pygame is only imported and initialised when rendering is requested
+        self.screen = None
         self.building_view = None
-        if self.render_mode == "human":
-            self.building_view = BuildingView(self.building, self.screen, self.font)
+        if self.render_mode in ("human", "rgb_array"):
+            self._init_renderer()
 
         self.num_floors = self.building.num_floors
         self.num_elevators = self.building.num_elevators
 
-    def _get_global_obs_part(self):
-        """Calculates the global part of the observation (waiting people)."""
-        up_requests = np.zeros(self.num_floors)
-        down_requests = np.zeros(self.num_floors)
-        for f in range(self.num_floors):
-            up_count = sum(1 for p in self.building.waiting_people[f] if p.destination_floor > f)
-            down_count = sum(1 for p in self.building.waiting_people[f] if p.destination_floor < f)
-            up_requests[f] = up_count
-            down_requests[f] = down_count
-        
-        normalization_factor = 10.0
-        up_requests /= normalization_factor
-        down_requests /= normalization_factor
-        return np.concatenate([up_requests, down_requests])
-
-    def _get_local_obs_part(self, elevator_idx):
-        """Calculates the local part of the observation for a single elevator."""
-        elev = self.building.get_elevator_state(elevator_idx)
-        floor_norm = elev['floor'] / (self.num_floors - 1)
-        
-        dir_onehot = np.zeros(3)
-        dir_map = {-1: 0, 0: 1, 1: 2}
-        dir_onehot[dir_map[elev['direction']]] = 1
-        
-        pass_counts = np.zeros(self.num_floors)
-        for dest in elev['passengers_dest']:
-            pass_counts[dest] += 1
-        pass_counts /= self.building.elevator_capacity # Normalize
-
-        return np.concatenate(([floor_norm], dir_onehot, pass_counts))
+        # compact_obs: raw integer counts, normalized later by the policy (see ObservationWriter)
+        self.obs_writer = ObservationWriter(self.building, compact=compact_obs)
 
     def reset_building(self):
         """Resets the underlying building simulation."""
         self.building.reset()
 
-    def render(self):
-        """Renders the environment."""
+    def _action_mask(self):
+        """Valid actions of every car as a `[num_elevators, 3]` bool array (see `action_mask`)."""
+        floors = np.fromiter((elevator.floor for elevator in self.building.elevators), dtype=np.int64,
+                             count=self.num_elevators)
+        return action_mask(floors, self.num_floors)
+
+    def _step_interval(self, actions, tick_reward):
+        """
+        Steps the building with `actions` and sums `tick_reward(update_infos)` over the ticks run.
+
+        With a `decision_interval` of k > 1 the actions are repeated until the next decision
+        point: a car reaches another floor, a car is stopped at the end of the shaft (its
+        move cannot happen, so it is effectively idle), a new passenger arrives, the episode
+        ends or k ticks have passed. Returns the update infos of the last tick, the summed
+        reward, done and the number of ticks run.
+        """
+        building = self.building
+        if self.decision_interval == 1:
+            _, update_infos, done, _ = building.step(actions)
+            return update_infos, tick_reward(update_infos), done, 1
+
+        elevators = building.elevators
+        top = self.num_floors - 1
+        reward = 0
+        for ticks in range(1, self.decision_interval + 1):
+            floors = [elevator.floor for elevator in elevators]
+            # Spawns, not the waiting count: a pickup in the same tick would hide an arrival
+            num_spawned = building.num_spawned
+            _, update_infos, done, _ = building.step(actions)
+            reward += tick_reward(update_infos)
+            if done or building.num_spawned > num_spawned:
+                break
+            if any(elevator.floor != floor or (action == 1 and floor == top) or (action == 2 and floor == 0)
+                   for elevator, floor, action in zip(elevators, floors, actions)):
+                break
+        return update_infos, reward, done, ticks
+
+    def _init_renderer(self):
+        """Initialises pygame, the drawing surface and the building view."""
+        import pygame
+        from view import BuildingView
+
+        pygame.init()
         if self.render_mode == "human":
-            self.building_view.draw()
+            self.screen = pygame.display.set_mode((ScreenConfig.WIDTH, ScreenConfig.HEIGHT))
+        else:
+            self.screen = pygame.Surface((ScreenConfig.WIDTH, ScreenConfig.HEIGHT))
+        self.font = pygame.font.Font(None, 24)
+        self.building_view = BuildingView(self.building, self.screen, self.font, flip=self.render_mode == "human")
+
+    def render(self):
+        """Renders the environment; returns an RGB array in "rgb_array" mode."""
+        if self.building_view is None:
+            return None
+
+        self.building_view.draw()
+        if self.render_mode == "rgb_array":
+            import pygame
+            return pygame.surfarray.array3d(self.screen).transpose(1, 0, 2)
 
     def close(self):
-        """Closes the environment and quits Pygame."""
-        pygame.quit()
+        """Closes the environment and quits Pygame if it was started."""
+        if self.building_view is not None:
+            import pygame
+            pygame.quit()
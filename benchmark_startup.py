@@ -0,0 +1,59 @@
+"""
+Measures import time and per-env construction cost of the elevator environments,
+headless (`render_mode=None`) versus with an off-screen renderer (`render_mode="rgb_array"`).
+
+Each measurement runs in a fresh interpreter so module caches do not leak between them.
+Run from a directory containing params.json:
+
+    python benchmark_startup.py --envs 64
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+MEASURE = """
+import json, sys, time, tracemalloc
+sys.path[:0] = [{repo!r}, {single_agent!r}]
+start = time.perf_counter()
+from single_agent_env import SingleAgentElevatorEnv
+import_time = time.perf_counter() - start
+pygame_loaded = 'pygame' in sys.modules
+
+tracemalloc.start()
+start = time.perf_counter()
+envs = [SingleAgentElevatorEnv(render_mode={render_mode!r}) for _ in range({num_envs})]
+construct_time = (time.perf_counter() - start) / {num_envs}
+peak = tracemalloc.get_traced_memory()[1] / {num_envs}
+print(json.dumps({{"import_s": import_time, "construct_ms": construct_time * 1e3,
+                  "peak_kib_per_env": peak / 1024, "pygame_imported": pygame_loaded or 'pygame' in sys.modules}}))
+"""
+
+
+def measure(render_mode, num_envs):
+    code = MEASURE.format(repo=REPO_DIR, single_agent=os.path.join(REPO_DIR, "single_agent"),
+                          render_mode=render_mode, num_envs=num_envs)
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark env import and construction cost.")
+    parser.add_argument("--envs", type=int, default=64, help="Number of envs constructed per run")
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per render mode; the best is reported")
+    args = parser.parse_args()
+
+    print(f"{'render_mode':<12} {'import (s)':>10} {'construct (ms/env)':>19} {'peak (KiB/env)':>15} {'pygame':>7}")
+    for render_mode in (None, "rgb_array"):
+        runs = [measure(render_mode, args.envs) for _ in range(args.repeats)]
+        best = {key: min(run[key] for run in runs) for key in ("import_s", "construct_ms", "peak_kib_per_env")}
+        print(f"{str(render_mode):<12} {best['import_s']:>10.3f} {best['construct_ms']:>19.3f} "
+              f"{best['peak_kib_per_env']:>15.1f} {str(runs[0]['pygame_imported']):>7}")
+
+
+if __name__ == "__main__":
+    main()
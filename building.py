@@ -1,8 +1,53 @@
 from constants import ElevatorConfig
 from elevator import Elevator
-from person import Person
+from floor_queue import FloorQueue
+from person import PersonPool
 
 import random 
+from collections.abc import Mapping
+from typing import NamedTuple
+
+
+class BuildingSnapshot(NamedTuple):
+    """
+    Flat copy of a `Building`'s dynamic state, from `Building.snapshot()`.
+    Holds only numbers, strings and tuples (plus the arrival process state), so it is cheap to keep and pickle.
+    """
+    clocks: tuple  # sim_time, last_spawn_time, day_timer, current_day, delivered count, total wait, total travel, num_waiting, num_spawned
+    hall_calls: tuple  # up_calls then down_calls
+    cars: tuple  # Elevator.snapshot_into records, one per car
+    queues: tuple  # FloorQueue.snapshot_into records, one per floor
+    rng_state: tuple  # random.getstate()
+    arrivals_state: object = None
+
+
+class BuildingStateView(Mapping):
+    """
+    Read-only mapping with the content of `Building.get_state()`, built the first time it is read.
+    It reads the live building, so copy it (`dict(view)`) to keep the state of a given step.
+    """
+    __slots__ = ('_building', '_state')
+
+    def __init__(self, building):
+        self._building = building
+        self._state = None
+
+    def _materialize(self) -> dict:
+        if self._state is None:
+            self._state = self._building.get_state()
+        return self._state
+
+    def __getitem__(self, key):
+        return self._materialize()[key]
+
+    def __iter__(self):
+        return iter(self._materialize())
+
+    def __len__(self) -> int:
+        return len(self._materialize())
+
+    def __repr__(self) -> str:
+        return f"BuildingStateView({self._materialize()!r})"
 
 
 class Building:
@@ -17,7 +62,9 @@ class Building:
             need_to_carry: int = 50,
             day_delay: float = 10,
             elevator_delay: float = 0.1,  # Giảm xuống để di chuyển nhanh hơn trong sim
-            sim_step_size: float = 0.01  # Thêm arg để tune sim speed (lớn = spawn/di chuyển nhanh hơn)
+            sim_step_size: float = 0.01,  # Thêm arg để tune sim speed (lớn = spawn/di chuyển nhanh hơn)
+            person_pool_size: int = 256,
+            arrivals=None  # Optional arrival process (e.g. arrivals.PoissonArrivals) replacing spawn_people
     ):
 
         self.num_floors = num_floors
@@ -47,14 +94,40 @@ class Building:
         self.last_spawn_time = self.sim_time
         self.day_timer = self.sim_time
 
+        self.person_pool = PersonPool(person_pool_size)
+        self.arrivals = arrivals  # Checked against num_floors by the setter
+
         self.elevators = [Elevator(self, ElevatorConfig.WIDTH, ElevatorConfig.HEIGHT, ElevatorConfig.DOOR_WIDTH, elevator_capacity, elevator_delay) for _ in range(num_elevators)]
 
-        self.waiting_people = [[] for _ in range(num_floors)]
+        self.waiting_people = [FloorQueue(f) for f in range(num_floors)]
+
+        # Hall-call counters, kept in sync by spawn_people and Elevator.pick_up
+        self.up_calls = [0] * num_floors
+        self.down_calls = [0] * num_floors
+        self.num_waiting = 0
+        self.num_spawned = 0  # Everyone spawned this episode; only ever grows, unlike num_waiting
 
+        # Updated by Elevator.drop_off as passengers alight
         self.delivered_people_count = 0
         self.total_wait_time = 0
         self.total_travel_time = 0
-        self.total_pickup_wait_time = 0
+
+    @property
+    def arrivals(self):
+        return self._arrivals
+
+    @arrivals.setter
+    def arrivals(self, arrivals):
+        # A process for another building would spawn people on floors that do not exist here
+        num_floors = getattr(arrivals, "num_floors", self.num_floors)
+        if num_floors != self.num_floors:
+            raise ValueError(f"{type(arrivals).__name__} generates arrivals for {num_floors} floors, "
+                             f"the building has {self.num_floors}")
+        self._arrivals = arrivals
+
+    @property
+    def total_pickup_wait_time(self):
+        return self.total_wait_time - self.total_travel_time
 
     def get_average_pickup_wait_time(self):
         if self.delivered_people_count == 0:
@@ -74,6 +147,14 @@ class Building:
         self.last_spawn_time = self.sim_time
         self.day_timer = self.sim_time
         self.current_day = 1
+        if self.arrivals is not None:
+            self.arrivals.reset()
+
+        # Hand everyone still in the building back to the pool
+        for floor_queue in self.waiting_people:
+            self.person_pool.release_all(floor_queue)
+        for elevator in self.elevators:
+            self.person_pool.release_all(elevator.passengers)
 
         self.elevators = [
             Elevator(
@@ -86,12 +167,72 @@ class Building:
             )
             for _ in range(self.num_elevators)
         ]
-        self.waiting_people = [[] for _ in range(self.num_floors)]
+        self.waiting_people = [FloorQueue(f) for f in range(self.num_floors)]
+        self.up_calls = [0] * self.num_floors
+        self.down_calls = [0] * self.num_floors
+        self.num_waiting = 0
+        self.num_spawned = 0
         self.delivered_people_count = 0
         self.total_wait_time = 0
         self.total_travel_time = 0
 
-        return self.get_state()
+        return BuildingStateView(self)
+
+    def snapshot(self) -> BuildingSnapshot:
+        """
+        Captures the dynamic state (clocks, counters, RNG and arrival process state, cars,
+        passengers and floor queues) in a flat `BuildingSnapshot` for `restore`.
+
+        The spawner draws from the global `random` module, so its state is part of the snapshot.
+        """
+        cars = []
+        for elevator in self.elevators:
+            elevator.snapshot_into(cars)
+        queues = []
+        for floor_queue in self.waiting_people:
+            floor_queue.snapshot_into(queues)
+
+        return BuildingSnapshot(
+            clocks=(
+                self.sim_time, self.last_spawn_time, self.day_timer, self.current_day,
+                self.delivered_people_count, self.total_wait_time, self.total_travel_time, self.num_waiting,
+                self.num_spawned,
+            ),
+            hall_calls=(*self.up_calls, *self.down_calls),
+            cars=tuple(cars),
+            queues=tuple(queues),
+            rng_state=random.getstate(),
+            arrivals_state=self.arrivals.get_state() if self.arrivals is not None else None,
+        )
+
+    def restore(self, snap: BuildingSnapshot) -> None:
+        """
+        Puts the building back in the state captured by `snapshot`. The snapshot must come
+        from a building with the same parameters; it is not modified and can be restored again.
+        Elevator and queue objects are reused, so views holding them stay valid.
+        """
+        (self.sim_time, self.last_spawn_time, self.day_timer, self.current_day,
+         self.delivered_people_count, self.total_wait_time, self.total_travel_time,
+         self.num_waiting, self.num_spawned) = snap.clocks
+        self.up_calls = list(snap.hall_calls[:self.num_floors])
+        self.down_calls = list(snap.hall_calls[self.num_floors:])
+        random.setstate(snap.rng_state)
+        if self.arrivals is not None:
+            self.arrivals.set_state(snap.arrivals_state)
+
+        # Hand everyone back to the pool, then rebuild cars and queues from it
+        pool = self.person_pool
+        for floor_queue in self.waiting_people:
+            pool.release_all(floor_queue)
+        for elevator in self.elevators:
+            pool.release_all(elevator.passengers)
+
+        i = 0
+        for elevator in self.elevators:
+            i = elevator.restore_from(snap.cars, i, pool)
+        i = 0
+        for floor_queue in self.waiting_people:
+            i = floor_queue.restore_from(snap.queues, i, pool)
 
     def get_elevator_state(self, idx) -> dict:
         """
@@ -122,6 +263,19 @@ class Building:
 
         return state
 
+    def add_waiting_person(self, start_floor: int, destination_floor: int, spawn_time: float) -> None:
+        """
+        Puts a new person in the queue of their start floor and updates the hall-call counters.
+        """
+        new_person = self.person_pool.acquire(start_floor, destination_floor, spawn_time)
+        self.waiting_people[start_floor].append(new_person)
+        if destination_floor > start_floor:
+            self.up_calls[start_floor] += 1
+        else:
+            self.down_calls[start_floor] += 1
+        self.num_waiting += 1
+        self.num_spawned += 1
+
     def spawn_people(self, spawn_frequency: float) -> None:
         """
         Docstring here
@@ -132,16 +286,31 @@ class Building:
             while destination_floor == start_floor:
                 destination_floor = random.randint(0, self.num_floors - 1)
             
-            new_person = Person(start_floor, destination_floor, self)  # Truyền self (building) vào Person để dùng sim_time
-            self.waiting_people[start_floor].append(new_person)
+            self.add_waiting_person(start_floor, destination_floor, self.sim_time)
             self.last_spawn_time = self.sim_time
 
+    def spawn_arrivals(self) -> None:
+        """
+        Spawns every arrival of the arrival process up to the current sim time, in one batch.
+        Each person keeps their own arrival time, so wait times stay exact for large step sizes.
+        """
+        times, origins, destinations = self.arrivals.pop_until(self.sim_time)
+        if len(times) == 0:
+            return
+
+        for spawn_time, start_floor, destination_floor in zip(times.tolist(), origins.tolist(), destinations.tolist()):
+            self.add_waiting_person(start_floor, destination_floor, spawn_time)
+        self.last_spawn_time = self.sim_time
+
     def seasonality_spawn(self) -> None:
         """
         Docstring here
         """
-        self.spawn_people(self.spawn_weight[self.current_day])
-        
+        if self._arrivals is not None:
+            self.spawn_arrivals()
+        else:
+            self.spawn_people(self.spawn_weight[self.current_day])
+
         if self.sim_time - self.day_timer > self.day_delay:
             self.day_timer = self.sim_time
             self.current_day = (self.current_day + 1) % 7
@@ -157,14 +326,9 @@ class Building:
         self.seasonality_spawn()
 
         self.sim_time += self.sim_step_size  # Tăng sim_time mỗi step
-        
-        self.delivered_people_count = sum(list(map(lambda x: x.delivered_people_count, self.elevators)))
-        self.total_wait_time = sum(list(map(lambda x: x.total_wait_time, self.elevators)))
-        self.total_travel_time = sum(list(map(lambda x: x.total_travel_time, self.elevators)))
-        self.total_pickup_wait_time = self.total_wait_time - self.total_travel_time
 
         done = False
         if self.delivered_people_count >= self.need_to_carry:
             done = True
 
-        return self.get_state(), update_infos, done, {}
+        return BuildingStateView(self), update_infos, done, {}
@@ -1,5 +1,3 @@
-import pygame
-
 class ScreenConfig:
 
     WIDTH = 1200
@@ -14,7 +14,8 @@ class Elevator:
 
         self.floor = 0
         self.target_floor = 0
-        self.passengers = []
+        self.passengers = {}  # Insertion-ordered set of passengers, in boarding order
+        self.passengers_by_dest = [[] for _ in range(building.num_floors)]
         self.state = "idle"  # "idle", "moving_up", "moving_down"
         self.direction = 0
         self.capacity = capacity
@@ -64,23 +65,31 @@ class Elevator:
         Handles dropping off passengers at the current floor.
         Returns the number of passengers dropped off.
         """
-        passengers_to_remove = []
+        bucket = self.passengers_by_dest[self.floor]
+        if not bucket:
+            return 0
+
+        now = self.building.sim_time
         wait_time = 0
         travel_time = 0
-        for passenger in self.passengers:
-            if passenger.destination_floor == self.floor: 
-                passengers_to_remove.append(passenger)
-                self.delivered_people_count += 1
-                wait_time += passenger.get_wait_time()
-                travel_time += passenger.get_travel_time()
+        for passenger in bucket:
+            del self.passengers[passenger]
+            wait_time += passenger.get_wait_time(now)
+            travel_time += passenger.get_travel_time(now)
 
-        for p in passengers_to_remove:
-            self.passengers.remove(p)
+        dropped_off = len(bucket)
+        self.building.person_pool.release_all(bucket)
+        bucket.clear()
 
+        self.delivered_people_count += dropped_off
         self.total_wait_time += wait_time
         self.total_travel_time += travel_time
 
-        return len(passengers_to_remove)
+        self.building.delivered_people_count += dropped_off
+        self.building.total_wait_time += wait_time
+        self.building.total_travel_time += travel_time
+
+        return dropped_off
 
 
     def pick_up(self) -> int: # Return count of picked up passengers
@@ -90,34 +99,30 @@ class Elevator:
         """
         passengers_picked_up_count = 0
         floor_queue = self.building.waiting_people[self.floor]
-        
+
         if self.direction == 0 and floor_queue and self.passengers:
-            pass_dest = self.passengers[0].destination_floor
+            pass_dest = next(iter(self.passengers)).destination_floor
             if pass_dest > self.floor:
                 self.direction = 1
             elif pass_dest < self.floor:
                 self.direction = -1
 
-        eligible_people = []
-        for person in floor_queue:
-            person_goes_up = person.destination_floor > self.floor
-            person_goes_down = person.destination_floor < self.floor
-            
-            if (self.direction == 1 and person_goes_up) or \
-               (self.direction == -1 and person_goes_down) or \
-               self.direction == 0:
-                eligible_people.append(person)
-
-        for person in eligible_people:
-            if len(self.passengers) < self.capacity:
-                floor_queue.remove(person)
-                self.passengers.append(person)
-                person.is_in_elevator = True
-                person.travel_start_time = self.building.sim_time
-                passengers_picked_up_count += 1
-            else:
+        while len(self.passengers) < self.capacity:
+            person = floor_queue.popleft(self.direction)
+            if person is None:
                 break
 
+            self.passengers[person] = None
+            self.passengers_by_dest[person.destination_floor].append(person)
+            person.travel_start_time = self.building.sim_time
+            passengers_picked_up_count += 1
+            if person.destination_floor > self.floor:
+                self.building.up_calls[self.floor] -= 1
+            else:
+                self.building.down_calls[self.floor] -= 1
+
+        self.building.num_waiting -= passengers_picked_up_count
+
         return passengers_picked_up_count
 
 
@@ -149,6 +154,43 @@ class Elevator:
 
 
 
+    def snapshot_into(self, out: list) -> None:
+        """
+        Appends the car state to the flat list `out`, followed by
+        (start floor, destination floor, spawn time, boarding time) per passenger in boarding order.
+        """
+        out += (
+            self.floor, self.target_floor, self.direction, self.state, self.run_timer,
+            self.delivered_people_count, self.total_wait_time, self.total_travel_time,
+            len(self.passengers),
+        )
+        for p in self.passengers:
+            out += (p.start_floor, p.destination_floor, p.spawn_time, p.travel_start_time)
+
+
+    def restore_from(self, flat, i: int, pool) -> int:
+        """
+        Restores the car from `flat[i:]` as written by `snapshot_into`, taking passengers
+        from `pool` (the current ones must already be released), and returns the next index.
+        """
+        (self.floor, self.target_floor, self.direction, self.state, self.run_timer,
+         self.delivered_people_count, self.total_wait_time, self.total_travel_time,
+         num_passengers) = flat[i:i + 9]
+        i += 9
+
+        self.passengers.clear()
+        for bucket in self.passengers_by_dest:
+            bucket.clear()
+        for _ in range(num_passengers):
+            start_floor, destination_floor, spawn_time, travel_start_time = flat[i:i + 4]
+            person = pool.acquire(start_floor, destination_floor, spawn_time)
+            person.travel_start_time = travel_start_time
+            self.passengers[person] = None
+            self.passengers_by_dest[destination_floor].append(person)
+            i += 4
+        return i
+
+
     def __repr__(self) -> str:
         """
         Docstring here
@@ -0,0 +1,82 @@
+from collections import deque
+from heapq import merge
+
+
+class FloorQueue:
+    """
+    People waiting on one floor, split into an up and a down FIFO deque.
+    Entries carry an arrival number so the floor can still be read in arrival order.
+    """
+    __slots__ = ('floor', 'up', 'down', '_arrivals')
+
+    def __init__(self, floor: int):
+
+        self.floor = floor
+        self.up = deque()
+        self.down = deque()
+        self._arrivals = 0
+
+    def append(self, person) -> None:
+        """
+        Adds a person to the deque of their travel direction.
+        """
+        queue = self.up if person.destination_floor > self.floor else self.down
+        queue.append((self._arrivals, person))
+        self._arrivals += 1
+
+    def popleft(self, direction: int):
+        """
+        Removes and returns the first person going in `direction`
+        (1 up, -1 down, 0 whoever arrived first), or None if there is nobody.
+        """
+        if direction == 1:
+            queue = self.up
+        elif direction == -1:
+            queue = self.down
+        elif self.up and self.down:
+            queue = self.up if self.up[0][0] < self.down[0][0] else self.down
+        else:
+            queue = self.up or self.down
+
+        if not queue:
+            return None
+        return queue.popleft()[1]
+
+    def snapshot_into(self, out: list) -> None:
+        """
+        Appends the queue to the flat list `out`: arrival counter, up and down lengths,
+        then (arrival number, start floor, destination floor, spawn time) per entry.
+        """
+        out += (self._arrivals, len(self.up), len(self.down))
+        for seq, person in self.up:
+            out += (seq, person.start_floor, person.destination_floor, person.spawn_time)
+        for seq, person in self.down:
+            out += (seq, person.start_floor, person.destination_floor, person.spawn_time)
+
+    def restore_from(self, flat, i: int, pool) -> int:
+        """
+        Refills the queue from `flat[i:]` as written by `snapshot_into`, taking people
+        from `pool` (the current ones must already be released), and returns the next index.
+        """
+        self._arrivals, num_up, num_down = flat[i:i + 3]
+        i += 3
+        for queue, count in ((self.up, num_up), (self.down, num_down)):
+            queue.clear()
+            for _ in range(count):
+                seq, start_floor, destination_floor, spawn_time = flat[i:i + 4]
+                queue.append((seq, pool.acquire(start_floor, destination_floor, spawn_time)))
+                i += 4
+        return i
+
+    def __len__(self) -> int:
+        return len(self.up) + len(self.down)
+
+    def __bool__(self) -> bool:
+        return bool(self.up) or bool(self.down)
+
+    def __iter__(self):
+        for _, person in merge(self.up, self.down, key=lambda entry: entry[0]):
+            yield person
+
+    def __repr__(self) -> str:
+        return f"FloorQueue(floor={self.floor},up={len(self.up)},down={len(self.down)})"
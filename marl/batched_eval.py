@@ -0,0 +1,114 @@
+import time
+
+import numpy as np
+
+from multi_agent_env import MARLElevatorEnv
+
+POLICY_ID = "shared_policy"
+
+
+def shared_policy_fn(algo, policy_id=POLICY_ID, explore=False):
+    """
+    Returns a function mapping a `[batch, obs_dim]` observation array to a `[batch]` action
+    array with one forward pass of the shared policy of an RLlib `Algorithm`
+    (a `Policy` on the old API stack, an `RLModule` on the new one).
+    """
+    # Every `Algorithm` has `get_policy`, but it only works on the old API stack
+    if not algo.config.enable_rl_module_and_learner:
+        policy = algo.get_policy(policy_id)
+
+        def compute(obs_batch):
+            actions, _, _ = policy.compute_actions(obs_batch, explore=explore)
+            return np.asarray(actions)
+        return compute
+
+    import torch
+    module = algo.get_module(policy_id)
+
+    def compute(obs_batch):
+        with torch.no_grad():
+            out = module.forward_inference({"obs": torch.from_numpy(obs_batch)})
+        return out["action_dist_inputs"].argmax(dim=-1).cpu().numpy()
+    return compute
+
+
+def run_episodes(policy_fn, num_episodes, num_envs=1, render_mode=None, delay=0.0, config=None, max_steps=None,
+                 decision_interval=1, on_episode=None):
+    """
+    Runs `num_episodes` episodes of `MARLElevatorEnv`, `num_envs` at a time in lockstep.
+    Every step, the observations of all agents of all running envs are stacked into one
+    batch for a single `policy_fn` call and the actions are split back per env and agent.
+
+    Returns the per-episode results (steps, delivered, avg_wait, total_reward) and a summary
+    with the total environment steps and steps per second. `on_episode` is called with each
+    result as soon as its episode ends. With `max_steps`, longer episodes are cut off there.
+    With a `decision_interval` above 1 a step can run several simulation ticks (see
+    `MARLElevatorEnv`), so fewer forward passes cover the same simulated time.
+    """
+    num_envs = max(1, min(num_envs, num_episodes))
+    envs = [MARLElevatorEnv(render_mode=render_mode, config=config, decision_interval=decision_interval)
+            for _ in range(num_envs)]
+    agents = envs[0].possible_agents
+    E = len(agents)
+    obs_batch = np.empty((num_envs * E, envs[0].obs_writer.agent_size), dtype=np.float32)
+
+    results = []
+    started = 0
+    running = []  # [env, slot, steps, total_reward]
+    for slot, env in enumerate(envs):
+        obs, _ = env.reset()
+        obs_batch[slot * E:(slot + 1) * E] = [obs[agent] for agent in agents]
+        running.append([env, slot, 0, 0.0])
+        started += 1
+
+    total_steps = 0
+    start = time.perf_counter()
+    while running:
+        # One forward pass for every agent of every running env
+        rows = np.concatenate([np.arange(slot * E, (slot + 1) * E) for _, slot, _, _ in running])
+        actions = np.empty(num_envs * E, dtype=np.int64)
+        actions[rows] = policy_fn(obs_batch[rows])
+
+        still_running = []
+        for entry in running:
+            env, slot = entry[0], entry[1]
+            obs, rewards, terminations, truncations, _ = env.step(dict(zip(agents, actions[slot * E:(slot + 1) * E].tolist())))
+            entry[2] += 1
+            entry[3] += sum(rewards.values())
+            total_steps += 1
+
+            if render_mode == "human":
+                env.render()
+                if delay > 0:
+                    time.sleep(delay)
+
+            done = any(terminations.values()) or any(truncations.values())
+            if done or entry[2] == max_steps:
+                building = env.building
+                delivered = building.delivered_people_count
+                result = {
+                    "episode": len(results) + 1,
+                    "steps": entry[2],
+                    "delivered": delivered,
+                    "avg_wait": building.total_wait_time / delivered if delivered else float("nan"),
+                    "total_reward": entry[3],
+                }
+                results.append(result)
+                if on_episode is not None:
+                    on_episode(result)
+                if started == num_episodes:
+                    continue
+                obs, _ = env.reset()
+                entry[2], entry[3] = 0, 0.0
+                started += 1
+
+            obs_batch[slot * E:(slot + 1) * E] = [obs[agent] for agent in agents]
+            still_running.append(entry)
+        running = still_running
+
+    elapsed = time.perf_counter() - start
+    for env in envs:
+        env.close()
+
+    summary = {"episodes": len(results), "steps": total_steps, "seconds": elapsed, "steps_per_second": total_steps / elapsed}
+    return results, summary
@@ -0,0 +1,90 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
+
+import numpy as np
+from pettingzoo.utils.conversions import parallel_to_aec
+from ray.rllib.env import PettingZooEnv
+
+from multi_agent_env import MARLElevatorEnv
+from rllib_env import ElevatorMultiAgentEnv, VectorElevatorMultiAgentEnv
+from sim_config import SimConfig
+
+# Samples RLlib would collect from each env, with random actions and no policy in the loop,
+# so only the env and its wrappers are timed. An agent step is one (obs, action, reward)
+# transition of one car; a sim tick advances the whole building.
+
+
+def bench_aec_chain(config, num_ticks, rng):
+    """The `PettingZooEnv(parallel_to_aec(MARLElevatorEnv))` chain: one car acts per `step`."""
+    env = PettingZooEnv(parallel_to_aec(MARLElevatorEnv(config=config)))
+    num_elevators = len(env.possible_agents)
+    obs, _ = env.reset()
+    agent_steps = 0
+    start = time.perf_counter()
+    while agent_steps < num_ticks * num_elevators:
+        obs, _, terminations, truncations, _ = env.step({agent: int(rng.integers(3)) for agent in obs})
+        agent_steps += 1
+        if terminations["__all__"] or truncations["__all__"]:
+            obs, _ = env.reset()
+    elapsed = time.perf_counter() - start
+    env.close()
+    return agent_steps, agent_steps // num_elevators, elapsed
+
+
+def bench_native(config, num_ticks, rng):
+    """`ElevatorMultiAgentEnv`: all cars act in one `step`."""
+    env = ElevatorMultiAgentEnv({"config": config})
+    obs, _ = env.reset()
+    agent_steps = 0
+    start = time.perf_counter()
+    for _ in range(num_ticks):
+        obs, _, terminations, truncations, _ = env.step({agent: int(rng.integers(3)) for agent in obs})
+        agent_steps += len(obs)
+        if terminations["__all__"] or truncations["__all__"]:
+            obs, _ = env.reset()
+    elapsed = time.perf_counter() - start
+    env.close()
+    return agent_steps, num_ticks, elapsed
+
+
+def bench_vector(config, num_ticks, rng, num_envs):
+    """`VectorElevatorMultiAgentEnv`: all cars of `num_envs` buildings act in one `step`."""
+    env = VectorElevatorMultiAgentEnv(num_envs, {"config": config}, seed=0)
+    obs, _ = env.reset()
+    agent_steps = 0
+    start = time.perf_counter()
+    for _ in range(max(1, num_ticks // num_envs)):
+        obs, _, _, _, _ = env.step([{agent: int(a) for agent, a in zip(env_obs, rng.integers(3, size=len(env_obs)))}
+                                    for env_obs in obs])
+        agent_steps += sum(len(env_obs) for env_obs in obs)
+    elapsed = time.perf_counter() - start
+    return agent_steps, agent_steps // env.num_elevators, elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare sampling throughput of the RLlib MARL env adapters.")
+    parser.add_argument("--ticks", type=int, default=20000, help="Simulation ticks per variant.")
+    parser.add_argument("--num-envs", type=int, nargs="+", default=[8, 32], help="Sizes of the vectorized variant.")
+    parser.add_argument("--config", type=str, default="params.json", help="Path to the simulation parameters file.")
+    args = parser.parse_args()
+
+    config = SimConfig.from_json(args.config)
+    rng = np.random.default_rng(0)
+
+    runs = [
+        ("PettingZooEnv(parallel_to_aec)", lambda: bench_aec_chain(config, args.ticks, rng)),
+        ("ElevatorMultiAgentEnv", lambda: bench_native(config, args.ticks, rng)),
+    ]
+    runs += [(f"VectorElevatorMultiAgentEnv x{n}", lambda n=n: bench_vector(config, args.ticks, rng, n)) for n in args.num_envs]
+
+    print(f"{'env':<34} {'agent steps/s':>14} {'sim ticks/s':>12} {'speedup':>8}")
+    baseline = None
+    for name, run in runs:
+        agent_steps, ticks, elapsed = run()
+        rate = agent_steps / elapsed
+        baseline = baseline or rate
+        print(f"{name:<34} {rate:>14,.0f} {ticks / elapsed:>12,.0f} {rate / baseline:>7.1f}x")
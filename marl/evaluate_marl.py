@@ -1,26 +1,21 @@
 import os
 import sys
 import inspect
-import time
 from ray.rllib.algorithms.algorithm import Algorithm
 from ray.tune.registry import register_env
-from ray.rllib.env import PettingZooEnv
-from pettingzoo.utils.conversions import parallel_to_aec
-from multi_agent_env import MARLElevatorEnv
+from rllib_env import ElevatorMultiAgentEnv
+from batched_eval import shared_policy_fn, run_episodes
 
 # --- Configuration ---
 CHECKPOINT_DIR = "../models/marl_ppo/"
 NUM_EPISODES = 3
 RENDER_MODE = "human" # "human" to watch, None for faster evaluation
 DELAY = 0.05 # Delay between steps in human render mode
+NUM_PARALLEL_ENVS = 8 # Episodes run at once when headless (one forward pass per step for all of them)
+DECISION_INTERVAL = 1 # Max ticks per policy query, as used in training
 
 # --- Environment Setup ---
-def env_creator(config):
-    parallel_env = MARLElevatorEnv(**config)
-    aec_env = parallel_to_aec(parallel_env)
-    return aec_env
-
-register_env("marl_elevator", lambda config: PettingZooEnv(env_creator(config)))
+register_env("marl_elevator", lambda config: ElevatorMultiAgentEnv(config))
 
 # --- Find latest checkpoint ---
 def find_latest_checkpoint(directory):
@@ -55,46 +50,20 @@ if __name__ == "__main__":
     # Load the trained algorithm
     algo = Algorithm.from_checkpoint(latest_checkpoint_path)
 
-    # Create the environment for evaluation
-    env = MARLElevatorEnv(render_mode=RENDER_MODE)
-
-    print("\n--- Starting Evaluation ---")
-    for ep in range(NUM_EPISODES):
-        print(f"\n--- Episode {ep + 1}/{NUM_EPISODES} ---")
-        
-        terminations = {agent: False for agent in env.possible_agents}
-        truncations = {agent: False for agent in env.possible_agents}
-        obs, info = env.reset()
-        
-        total_reward = {agent: 0 for agent in env.possible_agents}
-        steps = 0
-
-        while not (any(terminations.values()) or any(truncations.values())):
-            actions = {}
-            for agent_id in env.agents:
-                action = algo.compute_single_action(
-                    observation=obs[agent_id],
-                    policy_id="shared_policy",
-                    explore=False # Set to False for deterministic evaluation
-                )
-                actions[agent_id] = action
+    # One forward pass of the shared policy per step for every agent of every env
+    policy_fn = shared_policy_fn(algo, policy_id="shared_policy", explore=False)
+    num_envs = 1 if RENDER_MODE == "human" else NUM_PARALLEL_ENVS
 
-            obs, reward, terminations, truncations, info = env.step(actions)
-            
-            for agent_id, r in reward.items():
-                total_reward[agent_id] += r
+    def print_episode(result):
+        print(f"\n--- Episode {result['episode']}/{NUM_EPISODES} ---")
+        print(f"Episode finished after {result['steps']} steps.")
+        print(f"  - Delivered People: {result['delivered']}")
+        print(f"  - Average Wait Time: {result['avg_wait']:.2f}s")
+        print(f"  - Total Rewards: {result['total_reward']:.2f}")
 
-            if RENDER_MODE == "human":
-                env.render()
-                time.sleep(DELAY)
-            
-            steps += 1
-
-        building_stats = info.get("building_stats", {})
-        print(f"Episode finished after {steps} steps.")
-        print(f"  - Delivered People: {building_stats.get('delivered_people_count', 'N/A')}")
-        print(f"  - Average Wait Time: {building_stats.get('average_wait_time', 'N/A'):.2f}s")
-        print(f"  - Total Rewards: {sum(total_reward.values()):.2f}")
+    print("\n--- Starting Evaluation ---")
+    results, summary = run_episodes(policy_fn, NUM_EPISODES, num_envs=num_envs, render_mode=RENDER_MODE,
+                                    delay=DELAY, decision_interval=DECISION_INTERVAL, on_episode=print_episode)
 
-    env.close()
+    print(f"\n{summary['steps']} steps in {summary['seconds']:.1f}s ({summary['steps_per_second']:.0f} steps/s)")
     print("\n--- Evaluation Complete ---")
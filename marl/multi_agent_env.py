@@ -12,11 +12,18 @@ from base_env import BaseElevatorEnv
 
 class MARLElevatorEnv(ParallelEnv, BaseElevatorEnv):
 
-    metadata = {"render_modes": ["human"], "name": "elevator_marl_v0"}
+    metadata = {"render_modes": ["human", "rgb_array"], "name": "elevator_marl_v0"}
 
-    def __init__(self, render_mode=None, sim_step_size=1.0):
+    # ParallelEnv comes first in the MRO, so take rendering and cleanup from the base explicitly
+    render = BaseElevatorEnv.render
+    close = BaseElevatorEnv.close
+
+    def __init__(self, render_mode=None, sim_step_size=1.0, config=None, decision_interval=1, action_mask=False):
         # Initialize the base environment
-        BaseElevatorEnv.__init__(self, render_mode=render_mode, sim_step_size=sim_step_size)
+        BaseElevatorEnv.__init__(self, render_mode=render_mode, sim_step_size=sim_step_size, config=config,
+                                 decision_interval=decision_interval)
+        # Observations as RLlib action-masking dicts: {"observations": obs, "action_mask": valid actions}
+        self.action_mask = action_mask
 
         # PettingZoo API attributes
         self.possible_agents = [f"elevator_{i}" for i in range(self.num_elevators)]
@@ -27,9 +34,10 @@ class MARLElevatorEnv(ParallelEnv, BaseElevatorEnv):
 
     @lru_cache(maxsize=None)
     def observation_space(self, agent):
-        elevator_state_size = 1 + 3 + self.num_floors
-        waiting_size = self.num_floors * 2
-        return spaces.Box(low=-np.inf, high=np.inf, shape=(elevator_state_size + waiting_size,), dtype=np.float32)
+        obs_space = spaces.Box(low=-np.inf, high=np.inf, shape=(self.obs_writer.agent_size,), dtype=np.float32)
+        if self.action_mask:
+            return spaces.Dict({"observations": obs_space, "action_mask": spaces.Box(0.0, 1.0, shape=(3,), dtype=np.float32)})
+        return obs_space
 
     @lru_cache(maxsize=None)
     def action_space(self, agent):
@@ -42,31 +50,35 @@ class MARLElevatorEnv(ParallelEnv, BaseElevatorEnv):
         infos = {agent: {} for agent in self.agents}
         return observations, infos
 
-    def step(self, actions):
-        action_list = [actions[agent] for agent in self.possible_agents]
-        _, update_infos, done, _ = self.building.step(action_list)
-
-        rewards = {}
-        num_waiting_on_floors = sum(len(q) for q in self.building.waiting_people)
+    def _tick_rewards(self, update_infos):
+        # Per-agent rewards of one tick, as an array so they can be summed over ticks
+        agent_rewards = np.empty(self.num_elevators)
+        num_waiting_on_floors = self.building.num_waiting
         system_penalty = (0.05 * num_waiting_on_floors) / self.num_elevators
 
-        for i, agent in enumerate(self.possible_agents):
-            info = update_infos[i]
+        for i, info in enumerate(update_infos):
             agent_reward = 0
-            if info['is_idle'] and (any(self.building.waiting_people) or info['num_passengers'] > 0):
+            if info['is_idle'] and (self.building.num_waiting > 0 or info['num_passengers'] > 0):
                 agent_reward -= 1.0
             agent_reward += 50.0 * info['passengers_dropped_off']
             agent_reward += 10.0 * info['passengers_picked_up']
             agent_reward -= 0.05 * info['num_passengers']
             agent_reward -= system_penalty
-            rewards[agent] = agent_reward
+            agent_rewards[i] = agent_reward
+        return agent_rewards
+
+    def step(self, actions):
+        action_list = [actions[agent] for agent in self.possible_agents]
+        # One tick, or several with a decision_interval (rewards summed over them)
+        _, agent_rewards, done, ticks = self._step_interval(action_list, self._tick_rewards)
+        rewards = dict(zip(self.possible_agents, agent_rewards.tolist()))
 
         terminations = {agent: done for agent in self.agents}
         truncations = {agent: False for agent in self.agents}
         
         observations = self._get_obs()
         
-        infos = {agent: {} for agent in self.agents}
+        infos = {agent: {"ticks": ticks} for agent in self.agents}
         if done:
             delivered_count = self.building.delivered_people_count
             avg_wait = self.building.total_wait_time / delivered_count if delivered_count > 0 else float('inf')
@@ -80,9 +92,10 @@ class MARLElevatorEnv(ParallelEnv, BaseElevatorEnv):
         return observations, rewards, terminations, truncations, infos
 
     def _get_obs(self):
-        global_state = self._get_global_obs_part()
-        observations = {}
-        for i, agent_id in enumerate(self.possible_agents):
-            local_state = self._get_local_obs_part(i)
-            observations[agent_id] = np.concatenate([local_state, global_state]).astype(np.float32)
-        return observations
\ No newline at end of file
+        # One stacked float32 array per step, handed out as per-agent row views
+        stacked = self.obs_writer.write_agents()
+        if self.action_mask:
+            masks = self._action_mask().astype(np.float32)
+            return {agent_id: {"observations": stacked[i], "action_mask": masks[i]}
+                    for i, agent_id in enumerate(self.possible_agents)}
+        return {agent_id: stacked[i] for i, agent_id in enumerate(self.possible_agents)}
\ No newline at end of file
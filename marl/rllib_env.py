@@ -0,0 +1,177 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from ray.rllib.callbacks.utils import make_callback
+from ray.rllib.env.multi_agent_env import MultiAgentEnv
+from ray.rllib.env.multi_agent_env_runner import MultiAgentEnvRunner
+from ray.rllib.env.vector.vector_multi_agent_env import VectorMultiAgentEnv
+from gymnasium import spaces
+
+from action_mask import action_mask
+from multi_agent_env import MARLElevatorEnv
+from observation import VectorObservationWriter
+from sim_config import SimConfig
+from vector_building import VectorBuilding
+
+
+class ElevatorMultiAgentEnv(MultiAgentEnv):
+    """
+    RLlib `MultiAgentEnv` over `MARLElevatorEnv`, without the `parallel_to_aec` +
+    `PettingZooEnv` round trip: all cars act in one `step(action_dict)`, and the
+    per-agent observations are row views into one stacked array.
+
+    `env_config` takes the `MARLElevatorEnv` arguments (render_mode, sim_step_size, config,
+    decision_interval, action_mask). With `action_mask=True` each observation is a
+    `{"observations", "action_mask"}` dict, the layout of RLlib's action-masking RLModule example.
+    """
+
+    def __init__(self, env_config=None):
+        super().__init__()
+        self.env = MARLElevatorEnv(**dict(env_config or {}))
+
+        self.possible_agents = list(self.env.possible_agents)
+        self.agents = []
+        self.observation_spaces = {agent: self.env.observation_space(agent) for agent in self.possible_agents}
+        self.action_spaces = {agent: self.env.action_space(agent) for agent in self.possible_agents}
+        # Old API stack
+        self.observation_space = spaces.Dict(self.observation_spaces)
+        self.action_space = spaces.Dict(self.action_spaces)
+
+    def reset(self, *, seed=None, options=None):
+        obs, infos = self.env.reset(seed=seed, options=options)
+        self.agents = self.possible_agents[:]
+        return obs, infos
+
+    def step(self, action_dict):
+        obs, rewards, terminations, truncations, infos = self.env.step(action_dict)
+        terminations["__all__"] = any(terminations.values())
+        truncations["__all__"] = any(truncations.values())
+        if terminations["__all__"] or truncations["__all__"]:
+            self.agents = []
+        return obs, rewards, terminations, truncations, infos
+
+    def render(self):
+        return self.env.render()
+
+    def close(self):
+        self.env.close()
+
+
+class VectorElevatorMultiAgentEnv(VectorMultiAgentEnv):
+    """
+    `num_envs` elevator buildings in one `VectorBuilding`, stepped with a single batched
+    call for RLlib's `MultiAgentEnvRunner` (`num_envs_per_env_runner`), with the same
+    rewards and observations as `MARLElevatorEnv`.
+
+    Follows `SyncVectorMultiAgentEnv`: `step` takes and returns one dict per sub-env, and
+    a sub-env that finished is reset on its next step (its actions are ignored).
+    Observations are row views into one `[num_envs, num_elevators, obs_size]` array.
+    Every step is one tick: a `decision_interval` above 1 is not supported. With
+    `action_mask=True` the masks of all cars of all buildings come from one batched call.
+    """
+
+    def __init__(self, num_envs, env_config=None, seed=None):
+        super().__init__()
+        env_config = dict(env_config or {})
+        if env_config.get("decision_interval", 1) > 1:
+            raise ValueError("VectorElevatorMultiAgentEnv steps one tick at a time; use ElevatorMultiAgentEnv "
+                             "(num_envs_per_env_runner=1) with a decision interval")
+        self.config = SimConfig.coerce(env_config.get("config"))
+        self.num_envs = num_envs
+        self.building = VectorBuilding(num_envs, **self.config.vector_building_kwargs(),
+                                       sim_step_size=env_config.get("sim_step_size", 1.0), seed=seed)
+        self.obs_writer = VectorObservationWriter(self.building)
+        self.num_elevators = self.building.num_elevators
+        self.action_mask = env_config.get("action_mask", False)
+
+        # The runner reads spaces and agent ids from `envs[i].unwrapped`;
+        # all sub-envs share one (never stepped) template
+        template = ElevatorMultiAgentEnv({"config": self.config, "action_mask": self.action_mask})
+        self.envs = [template] * num_envs
+        self.possible_agents = template.possible_agents
+        self.metadata = dict(template.env.metadata, autoreset_mode="next_step")
+        self.single_observation_spaces = template.observation_spaces
+        self.single_action_spaces = template.action_spaces
+        self.single_observation_space = spaces.Dict(self.single_observation_spaces)
+        self.single_action_space = spaces.Dict(self.single_action_spaces)
+
+        self._autoreset = np.zeros(num_envs, dtype=bool)
+
+    def _split_obs(self):
+        # A fresh stacked array per step: the runner keeps the observations in its episodes
+        stacked = self.obs_writer.write_agents()
+        if self.action_mask:
+            masks = action_mask(self.building.floor, self.building.num_floors).astype(np.float32)
+            return [{agent: {"observations": obs, "action_mask": mask}
+                     for agent, obs, mask in zip(self.possible_agents, env_obs, env_masks)}
+                    for env_obs, env_masks in zip(stacked, masks)]
+        return [dict(zip(self.possible_agents, env_obs)) for env_obs in stacked]
+
+    def reset(self, *, seed=None, options=None):
+        if seed is not None:
+            self.building.rng = np.random.default_rng(seed)
+        self.building.reset()
+        self._autoreset[:] = False
+        return self._split_obs(), [{} for _ in range(self.num_envs)]
+
+    def step(self, actions):
+        agents = self.possible_agents
+        action_array = np.array([[env_actions.get(agent, 0) for agent in agents] for env_actions in actions])
+        update_infos, dones = self.building.step(action_array)
+
+        num_waiting = self.building.num_waiting()
+        num_passengers = update_infos['num_passengers']
+        busy = (num_waiting > 0)[:, None] | (num_passengers > 0)
+        agent_rewards = (
+            -1.0 * (update_infos['is_idle'] & busy)
+            + 50.0 * update_infos['passengers_dropped_off']
+            + 10.0 * update_infos['passengers_picked_up']
+            - 0.05 * num_passengers
+            - (0.05 * num_waiting / self.num_elevators)[:, None]
+        )
+
+        # Sub-envs that finished last step start over instead
+        reset_envs = self._autoreset
+        dones = dones & ~reset_envs
+        infos = [{} for _ in range(self.num_envs)]
+        for i in np.flatnonzero(dones).tolist():
+            delivered = int(self.building.delivered_people_count[i])
+            avg_wait = float(self.building.total_wait_time[i]) / delivered
+            infos[i] = {agent: {"avg_wait": avg_wait, "delivered": delivered} for agent in agents}
+        if reset_envs.any():
+            self.building.reset(reset_envs)
+            agent_rewards[reset_envs] = 0.0
+
+        observations = self._split_obs()
+        rewards = [dict(zip(agents, env_rewards)) for env_rewards in agent_rewards.tolist()]
+        terminations = [dict.fromkeys(agents + ["__all__"], done) for done in dones.tolist()]
+        truncations = [dict.fromkeys(agents + ["__all__"], False) for _ in range(self.num_envs)]
+
+        self._autoreset = dones
+        return observations, rewards, terminations, truncations, infos
+
+
+class VectorElevatorEnvRunner(MultiAgentEnvRunner):
+    """
+    `MultiAgentEnvRunner` that samples from one `VectorElevatorMultiAgentEnv` of
+    `num_envs_per_env_runner` buildings instead of a `SyncVectorMultiAgentEnv` loop
+    over separate envs. Use with `config.env_runners(env_runner_cls=VectorElevatorEnvRunner)`.
+    """
+
+    def make_env(self):
+        if self.env is not None:
+            self.env.close()
+
+        # Seeded by the runner's first reset
+        self.env = VectorElevatorMultiAgentEnv(self.config.num_envs_per_env_runner, dict(self.config.env_config))
+        self.num_envs = self.env.num_envs
+        self._needs_initial_reset = True
+
+        make_callback(
+            "on_environment_created",
+            callbacks_objects=self._callbacks,
+            callbacks_functions=self.config.callbacks_on_environment_created,
+            kwargs=dict(env_runner=self, metrics_logger=self.metrics, env=self.env, env_context=self.config.env_config),
+        )
@@ -8,20 +8,26 @@ sys.path.insert(0, currentdir)
 
 from ray.rllib.algorithms.ppo import PPOConfig
 from ray.tune.registry import register_env
-from ray.rllib.env import PettingZooEnv
 from ray.rllib.policy.policy import PolicySpec
 from multi_agent_env import MARLElevatorEnv
-from pettingzoo.utils.conversions import parallel_to_aec
+from rllib_env import ElevatorMultiAgentEnv, VectorElevatorEnvRunner
+from sim_config import SimConfig
 
-def env_creator(config):
-    parallel_env = MARLElevatorEnv(**config)
-    aec_env = parallel_to_aec(parallel_env)
-    return aec_env
+# All elevators act in one step, no parallel_to_aec/PettingZooEnv round trip
+register_env("marl_elevator", lambda config: ElevatorMultiAgentEnv(config))
 
-register_env("marl_elevator", lambda config: PettingZooEnv(env_creator(config)))
+# Buildings per env runner; above 1 they are stepped together in one VectorElevatorMultiAgentEnv
+NUM_ENVS_PER_ENV_RUNNER = 1
+
+# Ticks an action may be repeated for (until a car reaches a floor or a passenger arrives);
+# 1 queries the policy every tick. Only supported with NUM_ENVS_PER_ENV_RUNNER = 1
+DECISION_INTERVAL = 1
+
+# Parsed and validated once here; the frozen config is pickled to every env runner through env_config
+SIM_CONFIG = SimConfig.from_json("params.json")
 
 # Create a dummy env to get the obs/action spaces for the shared policy
-temp_env = MARLElevatorEnv()
+temp_env = MARLElevatorEnv(config=SIM_CONFIG)
 ob_space = temp_env.observation_space(temp_env.possible_agents[0])
 ac_space = temp_env.action_space(temp_env.possible_agents[0])
 temp_env.close()
@@ -31,11 +37,16 @@ config = (
     PPOConfig()
     .environment(
         "marl_elevator",
-        env_config={"render_mode": None, "sim_step_size": 1.0},
+        env_config={"render_mode": None, "sim_step_size": 1.0, "config": SIM_CONFIG, "decision_interval": DECISION_INTERVAL},
         disable_env_checking=True
     )
     .framework("torch")
-    .env_runners(num_env_runners=3, rollout_fragment_length='auto')
+    .env_runners(
+        num_env_runners=3,
+        rollout_fragment_length='auto',
+        num_envs_per_env_runner=NUM_ENVS_PER_ENV_RUNNER,
+        **({"env_runner_cls": VectorElevatorEnvRunner} if NUM_ENVS_PER_ENV_RUNNER > 1 else {}),
+    )
     .training(
         gamma=0.995,
         lr=0.0005,
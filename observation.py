@@ -0,0 +1,211 @@
+import numpy as np
+
+# Normalization of the hall-call counts in the global part of the observation
+WAITING_NORMALIZATION = 10.0
+
+
+def local_obs_size(num_floors: int) -> int:
+    """Size of one elevator's part: normalized floor, direction one-hot, passenger destination histogram."""
+    return 1 + 3 + num_floors
+
+
+def global_obs_size(num_floors: int) -> int:
+    """Size of the shared part: up and down hall-call counts per floor."""
+    return 2 * num_floors
+
+
+def compact_obs_dtype(num_floors: int, elevator_capacity: int):
+    """Integer dtype of the compact observation: uint8 when floor indices and car loads fit, else uint16."""
+    return np.uint8 if max(num_floors - 1, elevator_capacity) <= np.iinfo(np.uint8).max else np.uint16
+
+
+def compact_obs_scale(num_floors: int, num_elevators: int, elevator_capacity: int):
+    """
+    Per-entry factors that turn a compact single-agent observation into the float one:
+    the floor index is divided by the top floor, passenger counts by the capacity and
+    hall-call counts by `WAITING_NORMALIZATION`; the direction one-hot is kept as is.
+    """
+    local = np.ones(local_obs_size(num_floors), dtype=np.float32)
+    local[0] = 1.0 / (num_floors - 1)
+    local[4:] = 1.0 / elevator_capacity
+    hall_calls = np.full(global_obs_size(num_floors), 1.0 / WAITING_NORMALIZATION, dtype=np.float32)
+    return np.concatenate([np.tile(local, num_elevators), hall_calls])
+
+
+class ObservationWriter:
+    """
+    Writes the observation of one `Building` into preallocated buffers.
+
+    Single-agent layout (`write`): every elevator's local part, then the global part.
+    Multi-agent layout (`write_agents`): one row per elevator, local part then global part.
+
+    By default the entries are normalized float32. With `compact=True` they are the raw
+    integer counts (floor index, direction one-hot, passengers per destination, hall calls)
+    in `compact_obs_dtype`, hall calls saturating at its maximum; multiplying by
+    `compact_obs_scale` gives the float observation.
+
+    `write` alternates between two owned buffers, so the previous observation stays
+    valid for one more call (e.g. a vec env's terminal observation across the reset).
+    """
+
+    def __init__(self, building, compact=False):
+
+        self.building = building
+        self.num_floors = building.num_floors
+        self.num_elevators = building.num_elevators
+
+        self.local_size = local_obs_size(self.num_floors)
+        self.global_size = global_obs_size(self.num_floors)
+        self.size = self.num_elevators * self.local_size + self.global_size
+        self.agent_size = self.local_size + self.global_size
+
+        self.compact = compact
+        if compact:
+            self.dtype = compact_obs_dtype(self.num_floors, building.elevator_capacity)
+            self._max_count = np.iinfo(self.dtype).max
+            self._write_local = self._write_local_compact
+            self._write_global = self._write_global_compact
+        else:
+            self.dtype = np.float32
+
+        self._buffers = np.zeros((2, self.size), dtype=self.dtype)
+        self._current = 0
+
+    def _write_local(self, out, elevator) -> None:
+        F = self.num_floors
+        out[0] = elevator.floor / (F - 1)
+        out[1:4] = 0.0
+        out[2 + elevator.direction] = 1.0  # -1, 0, 1 -> 1, 2, 3
+        out[4:] = [len(bucket) for bucket in elevator.passengers_by_dest]
+        out[4:] /= self.building.elevator_capacity
+
+    def _write_global(self, out) -> None:
+        F = self.num_floors
+        out[:F] = self.building.up_calls
+        out[F:] = self.building.down_calls
+        out /= WAITING_NORMALIZATION
+
+    def _write_local_compact(self, out, elevator) -> None:
+        out[0] = elevator.floor
+        out[1:4] = 0
+        out[2 + elevator.direction] = 1
+        out[4:] = [len(bucket) for bucket in elevator.passengers_by_dest]
+
+    def _write_global_compact(self, out) -> None:
+        F = self.num_floors
+        out[:F] = np.minimum(self.building.up_calls, self._max_count)
+        out[F:] = np.minimum(self.building.down_calls, self._max_count)
+
+    def write(self, out=None):
+        """
+        Fills the single-agent observation into `out` (an array of `size` and `dtype`,
+        e.g. one row of a `[n_envs, size]` batch) or into the next owned buffer, and returns it.
+        """
+        if out is None:
+            self._current ^= 1
+            out = self._buffers[self._current]
+
+        L = self.local_size
+        for i, elevator in enumerate(self.building.elevators):
+            self._write_local(out[i * L:(i + 1) * L], elevator)
+        self._write_global(out[self.num_elevators * L:])
+        return out
+
+    def write_agents(self, out=None):
+        """
+        Fills the per-elevator observations into `out` (`[num_elevators, agent_size]`,
+        allocated if not given) and returns it.
+        """
+        if out is None:
+            out = np.empty((self.num_elevators, self.agent_size), dtype=self.dtype)
+
+        L = self.local_size
+        self._write_global(out[0, L:])
+        out[1:, L:] = out[0, L:]
+        for i, elevator in enumerate(self.building.elevators):
+            self._write_local(out[i, :L], elevator)
+        return out
+
+
+class VectorObservationWriter:
+    """
+    Batched `ObservationWriter` for a `VectorBuilding`: writes the observations of
+    all its buildings straight into a caller-supplied array (float32, or the integer
+    counts of `compact_obs_dtype` with `compact=True`).
+    """
+
+    def __init__(self, vector_building, compact=False):
+
+        self.building = vector_building
+        self.num_envs = vector_building.num_envs
+        self.num_floors = vector_building.num_floors
+        self.num_elevators = vector_building.num_elevators
+
+        self.local_size = local_obs_size(self.num_floors)
+        self.global_size = global_obs_size(self.num_floors)
+        self.size = self.num_elevators * self.local_size + self.global_size
+        self.agent_size = self.local_size + self.global_size
+
+        self.compact = compact
+        if compact:
+            self.dtype = compact_obs_dtype(self.num_floors, vector_building.elevator_capacity)
+            self._max_count = np.iinfo(self.dtype).max
+            self._write_local = self._write_local_compact
+            self._write_global = self._write_global_compact
+        else:
+            self.dtype = np.float32
+
+    def _write_local(self, local) -> None:
+        """Fills a `[num_envs, num_elevators, local_size]` view."""
+        building = self.building
+        np.divide(building.floor, self.num_floors - 1, out=local[..., 0])
+        local[..., 1:4] = 0.0
+        np.put_along_axis(local[..., 1:4], (building.direction + 1)[..., None], 1.0, axis=-1)
+        np.divide(building.passenger_counts(), building.elevator_capacity, out=local[..., 4:])
+
+    def _write_global(self, out) -> None:
+        """Fills a `[num_envs, global_size]` view."""
+        F = self.num_floors
+        up, down = self.building.hall_calls()
+        np.divide(up, WAITING_NORMALIZATION, out=out[:, :F])
+        np.divide(down, WAITING_NORMALIZATION, out=out[:, F:])
+
+    def _write_local_compact(self, local) -> None:
+        building = self.building
+        local[..., 0] = building.floor
+        local[..., 1:4] = 0
+        np.put_along_axis(local[..., 1:4], (building.direction + 1)[..., None], 1, axis=-1)
+        local[..., 4:] = building.passenger_counts()
+
+    def _write_global_compact(self, out) -> None:
+        F = self.num_floors
+        up, down = self.building.hall_calls()
+        out[:, :F] = np.minimum(up, self._max_count)
+        out[:, F:] = np.minimum(down, self._max_count)
+
+    def write(self, out=None):
+        """
+        Fills the single-agent observations into `out` (`[num_envs, size]` of `dtype`,
+        allocated if not given) and returns it.
+        """
+        if out is None:
+            out = np.empty((self.num_envs, self.size), dtype=self.dtype)
+
+        split = self.num_elevators * self.local_size
+        self._write_local(out[:, :split].reshape(self.num_envs, self.num_elevators, self.local_size))
+        self._write_global(out[:, split:])
+        return out
+
+    def write_agents(self, out=None):
+        """
+        Fills the per-elevator observations into `out` (`[num_envs, num_elevators, agent_size]`
+        of `dtype`, allocated if not given) and returns it.
+        """
+        if out is None:
+            out = np.empty((self.num_envs, self.num_elevators, self.agent_size), dtype=self.dtype)
+
+        L = self.local_size
+        self._write_global(out[:, 0, L:])
+        out[:, 1:, L:] = out[:, :1, L:]
+        self._write_local(out[..., :L])
+        return out
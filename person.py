@@ -1,66 +1,81 @@
-import random
-import time
-
 class Person:
     """
-    Represents a person waiting for an elevator.
+    Represents a person waiting for or riding an elevator.
+    Times are simulation times (`Building.sim_time`); rendering lives in `view.PersonView`.
     """
-    def __init__(self, start_floor, destination_floor, building=None):
+    __slots__ = ('start_floor', 'destination_floor', 'spawn_time', 'travel_start_time')
+
+    def __init__(self, start_floor, destination_floor, spawn_time=0.0):
 
         self.start_floor = start_floor
         self.destination_floor = destination_floor
-        self.is_in_elevator = False
-        self.is_delivered = False
-        self.x_offset = random.randint(-15, 15)
-        
-        self.building = building  # Thêm để truy cập sim_time
-        self.spawn_time = building.sim_time if building else time.time()  # Sử dụng sim_time
-        self.travel_start_time = None
-
-
-    def get_wait_time(self):
-        if self.building:
-            return self.building.sim_time - self.spawn_time
-        return time.time() - self.spawn_time
-
-
-    def get_travel_time(self):
-        if self.is_in_elevator:
-            if self.building:
-                return self.building.sim_time - self.travel_start_time
-            return time.time() - self.travel_start_time
-
-        return 0
-
+        self.spawn_time = spawn_time
+        self.travel_start_time = None  # Set when boarding
 
-    def draw(self, screen, x, y):
 
-        color = Color.BLUE
+    @property
+    def is_in_elevator(self):
+        return self.travel_start_time is not None
 
-        if self.is_delivered:
 
-            color = Color.GRAY
+    def get_wait_time(self, now):
+        return now - self.spawn_time
 
-        elif self.is_in_elevator:
 
-            color = Color.YELLOW
+    def get_travel_time(self, now):
+        if self.travel_start_time is not None:
+            return now - self.travel_start_time
 
-        pygame.draw.circle(screen, color, (x , y - 10), 5)
-
-        text = self.font.render(str(self.destination_floor + 1), True, Color.BLACK)
+        return 0
 
-        screen.blit(text, (x , y - 25))
 
-    
     def __repr__(self) -> str:
         """
         Docstring here
         """
         display_attribute = {
-                'start_floor':1,
+                'start_floor':self.start_floor,
                 'destination_floor':self.destination_floor,
                 'spawn_time':self.spawn_time
                 }
         parsed_attribute = [ f"{key}={value}" for key,value in sorted(display_attribute.items())]
 
-        return f"Elevator({','.join(parsed_attribute)})"
\ No newline at end of file
+        return f"Person({','.join(parsed_attribute)})"
+
+
+class PersonPool:
+    """
+    Free list of `Person` records, so spawning reuses the people that were
+    delivered or cleared by `Building.reset` instead of allocating new ones.
+    """
+
+    def __init__(self, size: int = 0):
+
+        self._free = [Person(0, 0) for _ in range(size)]
+
+
+    def acquire(self, start_floor, destination_floor, spawn_time) -> Person:
+        """
+        Returns a person initialised with the given trip, reusing a free record if there is one.
+        """
+        if not self._free:
+            return Person(start_floor, destination_floor, spawn_time)
+
+        person = self._free.pop()
+        person.start_floor = start_floor
+        person.destination_floor = destination_floor
+        person.spawn_time = spawn_time
+        person.travel_start_time = None
+        return person
+
+
+    def release(self, person: Person) -> None:
+        self._free.append(person)
+
+
+    def release_all(self, people) -> None:
+        self._free.extend(people)
+
+
+    def __len__(self) -> int:
+        return len(self._free)
@@ -0,0 +1,121 @@
+import json
+import os
+from dataclasses import dataclass, field, fields, replace
+
+from constants import ScreenConfig
+from observation import global_obs_size, local_obs_size
+
+# Days in the spawn_weight cycle (Building.current_day runs 0..6, Sunday first)
+DAYS_PER_WEEK = 7
+
+
+@dataclass(frozen=True)
+class SimConfig:
+    """
+    Immutable, validated simulation parameters (the contents of params.json).
+
+    Built once and handed to the environments (`SingleAgentElevatorEnv(config=...)`,
+    `MARLElevatorEnv(config=...)`, the RLlib `env_config`), so environments with different
+    buildings can live in one process and workers never re-read the file.
+    Derived values are computed once at construction.
+    """
+    num_floors: int
+    num_elevators: int
+    elevator_capacity: int
+    spawn_weight: tuple[float, ...]
+    need_to_carry: int = 50
+    day_delay: float = 10
+    elevator_delay: float = 0.1
+
+    # Derived
+    floor_height: int = field(init=False, repr=False, compare=False)
+    local_obs_size: int = field(init=False, repr=False, compare=False)
+    global_obs_size: int = field(init=False, repr=False, compare=False)
+    obs_size: int = field(init=False, repr=False, compare=False)
+    agent_obs_size: int = field(init=False, repr=False, compare=False)
+    spawn_rates: tuple[float, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Accept any sequence (e.g. a JSON list) but store a tuple so the config stays hashable
+        object.__setattr__(self, 'spawn_weight', tuple(float(w) for w in self.spawn_weight))
+
+        if self.num_floors < 2:
+            raise ValueError(f"num_floors must be at least 2, got {self.num_floors}")
+        if self.num_elevators < 1:
+            raise ValueError(f"num_elevators must be at least 1, got {self.num_elevators}")
+        if self.elevator_capacity < 1:
+            raise ValueError(f"elevator_capacity must be at least 1, got {self.elevator_capacity}")
+        if len(self.spawn_weight) != DAYS_PER_WEEK:
+            raise ValueError(f"spawn_weight must have {DAYS_PER_WEEK} entries (one per day), got {len(self.spawn_weight)}")
+        if min(self.spawn_weight) <= 0:
+            raise ValueError("spawn_weight entries must be positive")
+        if self.need_to_carry < 1:
+            raise ValueError(f"need_to_carry must be at least 1, got {self.need_to_carry}")
+        if self.day_delay <= 0 or self.elevator_delay < 0:
+            raise ValueError("day_delay must be positive and elevator_delay non-negative")
+
+        local_size = local_obs_size(self.num_floors)
+        global_size = global_obs_size(self.num_floors)
+        object.__setattr__(self, 'floor_height', ScreenConfig.HEIGHT // (self.num_floors + 1))
+        object.__setattr__(self, 'local_obs_size', local_size)
+        object.__setattr__(self, 'global_obs_size', global_size)
+        object.__setattr__(self, 'obs_size', self.num_elevators * local_size + global_size)
+        object.__setattr__(self, 'agent_obs_size', local_size + global_size)
+        object.__setattr__(self, 'spawn_rates', tuple(1.0 / w for w in self.spawn_weight))
+
+    @classmethod
+    def from_dict(cls, params):
+        """
+        Builds a config from a params.json-style dict, rejecting unknown keys.
+        """
+        names = {f.name for f in fields(cls) if f.init}
+        unknown = set(params) - names
+        if unknown:
+            raise ValueError(f"Unknown simulation parameters: {sorted(unknown)}")
+        return cls(**params)
+
+    @classmethod
+    def from_json(cls, path='params.json'):
+        with open(path, 'r') as f:
+            return cls.from_dict(json.load(f))
+
+    @classmethod
+    def coerce(cls, config):
+        """
+        Returns `config` as a SimConfig: passes one through, builds one from a dict,
+        loads a JSON path, and falls back to ./params.json for None.
+        """
+        if isinstance(config, cls):
+            return config
+        if isinstance(config, dict):
+            return cls.from_dict(config)
+        return load_config('params.json' if config is None else config)
+
+    def replace(self, **changes):
+        """Returns a validated copy with some parameters changed, for scenario sweeps."""
+        return replace(self, **changes)
+
+    def to_dict(self):
+        """The parameters as a params.json-style dict."""
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.init}
+
+    def building_kwargs(self):
+        """Keyword arguments for `Building` (minus the per-env step size)."""
+        return dict(self.to_dict(), floor_height=self.floor_height)
+
+    def vector_building_kwargs(self):
+        """Keyword arguments for `VectorBuilding` (minus num_envs and the per-env step size)."""
+        return self.to_dict()
+
+
+_loaded = {}
+
+
+def load_config(path='params.json'):
+    """
+    Loads a params.json file as a SimConfig, once per process and path.
+    """
+    path = os.path.abspath(path)
+    if path not in _loaded:
+        _loaded[path] = SimConfig.from_json(path)
+    return _loaded[path]
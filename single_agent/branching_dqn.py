@@ -0,0 +1,185 @@
+from typing import Any
+
+import numpy as np
+import torch as th
+from gymnasium import spaces
+from torch import nn
+from torch.nn import functional as F
+from stable_baselines3 import DQN
+from stable_baselines3.common.off_policy_algorithm import OffPolicyAlgorithm
+from stable_baselines3.common.policies import BasePolicy
+from stable_baselines3.common.torch_layers import create_mlp
+from stable_baselines3.dqn.policies import DQNPolicy
+
+
+class BranchingQNetwork(BasePolicy):
+    """
+    Action-branching Q-network for a `MultiDiscrete` action space: a shared MLP trunk,
+    a state value and one advantage head per action dimension (car), combined per branch
+    as Q_d(s, a) = V(s) + A_d(s, a) - mean_a A_d(s, a).
+
+    The output is `[batch, num_branches, branch_size]`, so the network and the greedy
+    decode (an argmax per branch) grow linearly with the number of cars instead of
+    exponentially like a flattened `Discrete(3 ** num_elevators)` head.
+    """
+
+    action_space: spaces.MultiDiscrete
+
+    def __init__(self, observation_space, action_space, features_extractor, features_dim,
+                 net_arch=None, activation_fn=nn.ReLU, normalize_images=True):
+        super().__init__(observation_space, action_space, features_extractor=features_extractor,
+                         normalize_images=normalize_images)
+
+        if len(set(action_space.nvec.tolist())) != 1:
+            raise ValueError("All action branches must have the same number of actions")
+        self.net_arch = net_arch if net_arch is not None else [64, 64]
+        self.activation_fn = activation_fn
+        self.features_dim = features_dim
+        self.num_branches = len(action_space.nvec)
+        self.branch_size = int(action_space.nvec[0])
+
+        self.q_net = nn.Sequential(*create_mlp(features_dim, -1, self.net_arch, activation_fn))
+        last_dim = self.net_arch[-1] if self.net_arch else features_dim
+        self.advantage_net = nn.Linear(last_dim, self.num_branches * self.branch_size)
+        self.value_net = nn.Linear(last_dim, 1)
+
+    def forward(self, obs):
+        latent = self.q_net(self.extract_features(obs, self.features_extractor))
+        advantages = self.advantage_net(latent).view(-1, self.num_branches, self.branch_size)
+        return self.value_net(latent).unsqueeze(-1) + advantages - advantages.mean(dim=2, keepdim=True)
+
+    def _predict(self, observation, deterministic=True):
+        # Greedy action of every branch
+        return self(observation).argmax(dim=2)
+
+    def _get_constructor_parameters(self) -> dict[str, Any]:
+        data = super()._get_constructor_parameters()
+        data.update(dict(
+            net_arch=self.net_arch,
+            features_dim=self.features_dim,
+            activation_fn=self.activation_fn,
+            features_extractor=self.features_extractor,
+        ))
+        return data
+
+
+class BranchingDQNPolicy(DQNPolicy):
+    """
+    `DQNPolicy` with a `BranchingQNetwork` (and target network) for `MultiDiscrete` actions.
+    """
+
+    def make_q_net(self):
+        net_args = self._update_features_extractor(self.net_args, features_extractor=None)
+        return BranchingQNetwork(**net_args).to(self.device)
+
+
+class BranchingDQN(DQN):
+    """
+    DQN over a `MultiDiscrete` action space with one Q-value head per car
+    (Branching Dueling Q-Network, https://arxiv.org/abs/1711.08946).
+
+    Every branch is regressed towards the shared TD target
+    r + gamma * mean_d max_a Q_target_d(s', a); the rest (replay buffer, epsilon-greedy
+    exploration, target updates, saving) is stable-baselines3's DQN. The env is used
+    without `FlattenActionWrapper`.
+    """
+
+    policy_aliases = {"MlpPolicy": BranchingDQNPolicy}
+
+    def __init__(
+        self,
+        policy,
+        env,
+        learning_rate=1e-4,
+        buffer_size=1_000_000,
+        learning_starts=100,
+        batch_size=32,
+        tau=1.0,
+        gamma=0.99,
+        train_freq=4,
+        gradient_steps=1,
+        replay_buffer_class=None,
+        replay_buffer_kwargs=None,
+        optimize_memory_usage=False,
+        n_steps=1,
+        target_update_interval=10000,
+        exploration_fraction=0.1,
+        exploration_initial_eps=1.0,
+        exploration_final_eps=0.05,
+        max_grad_norm=10,
+        stats_window_size=100,
+        tensorboard_log=None,
+        policy_kwargs=None,
+        verbose=0,
+        seed=None,
+        device="auto",
+        _init_setup_model=True,
+    ):
+        # Same as DQN.__init__, which only accepts Discrete action spaces
+        OffPolicyAlgorithm.__init__(
+            self,
+            policy,
+            env,
+            learning_rate,
+            buffer_size,
+            learning_starts,
+            batch_size,
+            tau,
+            gamma,
+            train_freq,
+            gradient_steps,
+            action_noise=None,
+            replay_buffer_class=replay_buffer_class,
+            replay_buffer_kwargs=replay_buffer_kwargs,
+            optimize_memory_usage=optimize_memory_usage,
+            n_steps=n_steps,
+            policy_kwargs=policy_kwargs,
+            stats_window_size=stats_window_size,
+            tensorboard_log=tensorboard_log,
+            verbose=verbose,
+            device=device,
+            seed=seed,
+            sde_support=False,
+            supported_action_spaces=(spaces.MultiDiscrete,),
+            support_multi_env=True,
+        )
+        self.exploration_initial_eps = exploration_initial_eps
+        self.exploration_final_eps = exploration_final_eps
+        self.exploration_fraction = exploration_fraction
+        self.target_update_interval = target_update_interval
+        self._n_calls = 0
+        self.max_grad_norm = max_grad_norm
+        self.exploration_rate = 0.0
+
+        if _init_setup_model:
+            self._setup_model()
+
+    def train(self, gradient_steps, batch_size=100):
+        self.policy.set_training_mode(True)
+        self._update_learning_rate(self.policy.optimizer)
+
+        losses = []
+        for _ in range(gradient_steps):
+            replay_data = self.replay_buffer.sample(batch_size, env=self._vec_normalize_env)
+            discounts = replay_data.discounts if replay_data.discounts is not None else self.gamma
+
+            with th.no_grad():
+                # [batch, branches, actions] -> greedy value per branch, averaged over branches
+                next_q_values = self.q_net_target(replay_data.next_observations).max(dim=2).values
+                next_q_values = next_q_values.mean(dim=1, keepdim=True)
+                target_q_values = replay_data.rewards + (1 - replay_data.dones) * discounts * next_q_values
+
+            current_q_values = self.q_net(replay_data.observations)
+            current_q_values = th.gather(current_q_values, dim=2, index=replay_data.actions.long().unsqueeze(-1)).squeeze(-1)
+
+            loss = F.smooth_l1_loss(current_q_values, target_q_values.expand_as(current_q_values))
+            losses.append(loss.item())
+
+            self.policy.optimizer.zero_grad()
+            loss.backward()
+            th.nn.utils.clip_grad_norm_(self.policy.parameters(), self.max_grad_norm)
+            self.policy.optimizer.step()
+
+        self._n_updates += gradient_steps
+        self.logger.record("train/n_updates", self._n_updates, exclude="tensorboard")
+        self.logger.record("train/loss", np.mean(losses))
@@ -0,0 +1,149 @@
+import numpy as np
+
+# Classical group-control dispatchers. Like `NormalAlgorithm`, `predict(building)` reads the
+# `Building` directly and returns one action per car (0 stop, 1 up, 2 down).
+
+
+def _move_towards(floor, target):
+    if floor < target:
+        return 1
+    if floor > target:
+        return 2
+    return 0
+
+
+def _look_action(elevator, up_calls, down_calls, home=None):
+    """
+    LOOK (collective control) for one car over the given hall-call counts per floor:
+    serve the current floor, keep going while there are car or hall calls ahead, then reverse.
+    With nothing to do the car heads to `home` (if given) or stays idle.
+    """
+    f = elevator.floor
+    num_floors = len(up_calls)
+    by_dest = elevator.passengers_by_dest
+
+    # A stopped car boards in its first passenger's direction, or anyone when empty
+    if elevator.passengers:
+        board = 1 if next(iter(elevator.passengers)).destination_floor > f else -1
+    else:
+        board = 0
+    if len(elevator.passengers) < elevator.capacity:
+        if (board >= 0 and up_calls[f]) or (board <= 0 and down_calls[f]):
+            return 0
+
+    above = any(by_dest[g] or up_calls[g] or down_calls[g] for g in range(f + 1, num_floors))
+    below = any(by_dest[g] or up_calls[g] or down_calls[g] for g in range(f))
+
+    direction = elevator.direction or board
+    if direction == 0 and above and below:
+        # Idle and empty: towards the nearest request
+        nearest_above = next(g for g in range(f + 1, num_floors) if up_calls[g] or down_calls[g])
+        nearest_below = next(g for g in range(f - 1, -1, -1) if up_calls[g] or down_calls[g])
+        direction = 1 if nearest_above - f < f - nearest_below else -1
+
+    if direction >= 0 and above:
+        return 1
+    if direction <= 0 and below:
+        return 2
+    if above:
+        return 1
+    if below:
+        return 2
+    return _move_towards(f, home) if home is not None else 0
+
+
+class CollectiveDispatcher:
+    """
+    Collective control: every car runs LOOK over its car calls and all hall calls,
+    stopping for waiting people on its way and reversing at the last request.
+    """
+
+    def predict(self, building, *args, **kwargs):
+        return np.array([_look_action(e, building.up_calls, building.down_calls) for e in building.elevators])
+
+
+class UpPeakZoningDispatcher:
+    """
+    Zoning for up-peak traffic: the floors above the lobby are split into one contiguous
+    zone per car. A car answers hall calls in its zone and at the lobby only, and parks
+    at the lobby when it has nothing to do.
+    """
+
+    def __init__(self, lobby=0):
+        self.lobby = lobby
+        self._zones = None
+
+    def _zone_masks(self, num_floors, num_elevators):
+        if self._zones is None or self._zones.shape != (num_elevators, num_floors):
+            floors = [f for f in range(num_floors) if f != self.lobby]
+            self._zones = np.zeros((num_elevators, num_floors), dtype=bool)
+            for car, zone in enumerate(np.array_split(floors, num_elevators)):
+                self._zones[car, zone] = True
+            self._zones[:, self.lobby] = True
+        return self._zones
+
+    def predict(self, building, *args, **kwargs):
+        zones = self._zone_masks(building.num_floors, building.num_elevators)
+        actions = []
+        for elevator, zone in zip(building.elevators, zones.tolist()):
+            up = [count if in_zone else 0 for count, in_zone in zip(building.up_calls, zone)]
+            down = [count if in_zone else 0 for count, in_zone in zip(building.down_calls, zone)]
+            actions.append(_look_action(elevator, up, down, home=self.lobby))
+        return np.array(actions)
+
+
+class ETADispatcher:
+    """
+    Estimated-time-of-arrival hall-call assignment: every up and down hall call is assigned
+    to the one car that can reach it soonest (in floors travelled, plus `stop_penalty` per
+    car-call stop on the way); full cars get no new calls. Each car then runs LOOK over
+    its car calls and its assigned hall calls only, so cars do not chase the same call.
+    """
+
+    def __init__(self, stop_penalty=1.0):
+        self.stop_penalty = stop_penalty
+
+    def _eta(self, elevator, call_floor, call_direction):
+        f = elevator.floor
+        stops = [g for g, bucket in enumerate(elevator.passengers_by_dest) if bucket]
+        direction = elevator.direction
+        if direction == 0 and stops:
+            direction = 1 if stops[0] > f else -1
+
+        if direction == 0:
+            return abs(call_floor - f)
+        if direction == 1:
+            if call_floor >= f and call_direction == 1:
+                distance = call_floor - f
+                on_the_way = sum(1 for g in stops if g < call_floor)
+            else:
+                top = max(stops + [call_floor, f])
+                distance = (top - f) + (top - call_floor)
+                on_the_way = len(stops)
+        else:
+            if call_floor <= f and call_direction == -1:
+                distance = f - call_floor
+                on_the_way = sum(1 for g in stops if g > call_floor)
+            else:
+                bottom = min(stops + [call_floor, f])
+                distance = (f - bottom) + (call_floor - bottom)
+                on_the_way = len(stops)
+        return distance + self.stop_penalty * on_the_way
+
+    def predict(self, building, *args, **kwargs):
+        num_floors = building.num_floors
+        elevators = building.elevators
+        assigned_up = [[0] * num_floors for _ in elevators]
+        assigned_down = [[0] * num_floors for _ in elevators]
+        available = [i for i, e in enumerate(elevators) if len(e.passengers) < e.capacity]
+
+        if available:
+            for calls, assigned, call_direction in ((building.up_calls, assigned_up, 1), (building.down_calls, assigned_down, -1)):
+                for floor, count in enumerate(calls):
+                    if count:
+                        car = min(available, key=lambda i: self._eta(elevators[i], floor, call_direction))
+                        assigned[car][floor] = count
+
+        return np.array([
+            _look_action(elevator, assigned_up[i], assigned_down[i]) for i, elevator in enumerate(elevators)
+        ])
@@ -0,0 +1,34 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import torch as th
+from stable_baselines3.common.torch_layers import BaseFeaturesExtractor
+
+from observation import compact_obs_scale
+from sim_config import SimConfig
+
+
+class CompactObsExtractor(BaseFeaturesExtractor):
+    """
+    Features extractor for compact observations (`compact_obs=True` envs): scales the
+    integer counts to the normalized float observation inside the policy, so the
+    replay/rollout buffers only ever hold the small integer form.
+    """
+
+    def __init__(self, observation_space, scale):
+        super().__init__(observation_space, features_dim=len(scale))
+        self.register_buffer("scale", th.as_tensor(scale, dtype=th.float32))
+
+    def forward(self, observations):
+        # stable-baselines3 has already cast the observations to float
+        return observations * self.scale
+
+
+def compact_obs_policy_kwargs(config=None):
+    """
+    `policy_kwargs` entries that make an `MlpPolicy` read compact observations of `config`.
+    """
+    config = SimConfig.coerce(config)
+    scale = compact_obs_scale(config.num_floors, config.num_elevators, config.elevator_capacity)
+    return {"features_extractor_class": CompactObsExtractor, "features_extractor_kwargs": {"scale": scale.tolist()}}
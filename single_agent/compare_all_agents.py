@@ -1,15 +1,22 @@
+import argparse
+import os
 import matplotlib.pyplot as plt
 from stable_baselines3 import PPO, DQN
 from single_agent_env import SingleAgentElevatorEnv
 from flatten_action_wrapper import FlattenActionWrapper
 from normal_algorithm import NormalAlgorithm
+from rollout_dispatcher import RolloutDispatcher
+from classical_dispatchers import CollectiveDispatcher, UpPeakZoningDispatcher, ETADispatcher
+from numpy_policy import NumpyPolicy
+from branching_dqn import BranchingDQN
 from utils import evaluate_model
+from parallel_eval import Scenario, make_jobs, run_evaluation, summarize
 
 # --- Configuration ---
 NUM_EPISODES = 1
 MAX_STEPS = 50000
 SIM_STEP_SIZE = 1.0
-RENDER_MODE = None # Set to None for faster evaluation
+RENDER_MODE = None # "human" to watch the episodes one by one; None runs them in parallel, headless
 
 AGENTS_TO_COMPARE = [
     {
@@ -26,54 +33,134 @@ AGENTS_TO_COMPARE = [
         "env_wrapper": FlattenActionWrapper,
         "eval_params": {"deterministic": True, "delay": 0}
     },
+    {
+        "name": "BDQ",
+        "model_loader": BranchingDQN, # One Q-value head per car, no FlattenActionWrapper
+        "model_path": "models/Single_agents/LR_00005/bdq_elevator.zip",
+        "env_wrapper": None,
+        "eval_params": {"deterministic": True, "delay": 0}
+    },
+    {
+        "name": "PPO-NumPy",
+        "model_loader": NumpyPolicy, # Exported with numpy_policy.py; no torch at evaluation time
+        "model_path": "models/Single_agents/LR_00005/ppo_elevator.npz",
+        "env_wrapper": None,
+        "eval_params": {"deterministic": True, "delay": 0}
+    },
+    {
+        "name": "DQN-NumPy",
+        "model_loader": NumpyPolicy,
+        "model_path": "models/Single_agents/LR_00005/dqn_elevator.npz",
+        "env_wrapper": FlattenActionWrapper,
+        "eval_params": {"deterministic": True, "delay": 0}
+    },
     {
         "name": "Rule-Based",
         "model_loader": NormalAlgorithm,
         "model_path": None, # Rule-based doesn't load from a file
         "env_wrapper": None,
         "eval_params": {"deterministic": True, "delay": 0}
+    },
+    {
+        "name": "Rollout",
+        "model_loader": RolloutDispatcher, # 5 ms budget per decision by default
+        "model_path": None,
+        "env_wrapper": None,
+        "eval_params": {"deterministic": True, "delay": 0}
+    },
+    {
+        "name": "Collective",
+        "model_loader": CollectiveDispatcher,
+        "model_path": None,
+        "env_wrapper": None,
+        "eval_params": {"deterministic": True, "delay": 0}
+    },
+    {
+        "name": "Zoning",
+        "model_loader": UpPeakZoningDispatcher,
+        "model_path": None,
+        "env_wrapper": None,
+        "eval_params": {"deterministic": True, "delay": 0}
+    },
+    {
+        "name": "ETA",
+        "model_loader": ETADispatcher,
+        "model_path": None,
+        "env_wrapper": None,
+        "eval_params": {"deterministic": True, "delay": 0}
     }
 ]
 
-# --- Evaluation Loop ---
-evaluation_results = {agent["name"]: [] for agent in AGENTS_TO_COMPARE}
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare trained agents and rule-based dispatchers.")
+    parser.add_argument("--agents", nargs="+", default=None, choices=[agent["name"] for agent in AGENTS_TO_COMPARE],
+                        help="Agents to evaluate (default: all whose model files exist).")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per core).")
+    parser.add_argument("--out", type=str, default=None, help="CSV file for the per-episode results.")
+    args = parser.parse_args()
+
+    # Trained models are not part of a fresh checkout: skip the missing ones unless asked for by name
+    missing = [agent for agent in AGENTS_TO_COMPARE if agent["model_path"] and not os.path.exists(agent["model_path"])]
+    if args.agents is None:
+        for agent in missing:
+            print(f"Warning: skipping {agent['name']}, model file {agent['model_path']} not found")
+        AGENTS_TO_COMPARE = [agent for agent in AGENTS_TO_COMPARE if agent not in missing]
+    else:
+        requested_missing = [agent for agent in missing if agent["name"] in args.agents]
+        if requested_missing:
+            parser.error(", ".join(f"{agent['name']}: model file {agent['model_path']} not found" for agent in requested_missing))
+        AGENTS_TO_COMPARE = [agent for agent in AGENTS_TO_COMPARE if agent["name"] in args.agents]
+
+    # --- Evaluation Loop ---
+    evaluation_results = {agent["name"]: [-1] * NUM_EPISODES for agent in AGENTS_TO_COMPARE}
 
-for ep in range(NUM_EPISODES):
-    print(f"\n--- Starting Episode {ep + 1}/{NUM_EPISODES} ---")
+    if RENDER_MODE == "human":
+        for ep in range(NUM_EPISODES):
+            print(f"\n--- Starting Episode {ep + 1}/{NUM_EPISODES} ---")
 
-    for agent_config in AGENTS_TO_COMPARE:
-        agent_name = agent_config["name"]
-        print(f"  Evaluating {agent_name}...")
+            for agent_config in AGENTS_TO_COMPARE:
+                agent_name = agent_config["name"]
+                print(f"  Evaluating {agent_name}...")
 
-        # Create environment for the agent
-        env = SingleAgentElevatorEnv(render_mode=RENDER_MODE, sim_step_size=SIM_STEP_SIZE)
-        if agent_config["env_wrapper"]:
-            env = agent_config["env_wrapper"](env)
+                # Create environment for the agent
+                env = SingleAgentElevatorEnv(render_mode=RENDER_MODE, sim_step_size=SIM_STEP_SIZE)
+                if agent_config["env_wrapper"]:
+                    env = agent_config["env_wrapper"](env)
 
-        # Load or initialize model
-        if agent_config["model_path"]:
-            model = agent_config["model_loader"].load(agent_config["model_path"], env=env)
-        else:
-            model = agent_config["model_loader"]()
+                # Load or initialize model
+                if agent_config["model_path"]:
+                    model = agent_config["model_loader"].load(agent_config["model_path"], env=env)
+                else:
+                    model = agent_config["model_loader"]()
 
-        # Evaluate and store results
-        info = evaluate_model(model, env, MAX_STEPS, **agent_config["eval_params"])
-        evaluation_results[agent_name].append(info.get('avg_wait', -1))
-        print(f"  Ep {ep + 1} {agent_name}: Avg Wait {info.get('avg_wait', -1):.2f}, Delivered {info.get('delivered', 0)}")
-        env.close()
+                # Evaluate and store results
+                info = evaluate_model(model, env, MAX_STEPS, **agent_config["eval_params"])
+                evaluation_results[agent_name][ep] = info.get('avg_wait', -1)
+                print(f"  Ep {ep + 1} {agent_name}: Avg Wait {info.get('avg_wait', -1):.2f}, Delivered {info.get('delivered', 0)}")
+                env.close()
+    else:
+        # One headless job per (agent, episode); episode i uses seed i, so all agents see the same traffic
+        scenario = Scenario("default", sim_step_size=SIM_STEP_SIZE, max_steps=MAX_STEPS)
+        jobs = make_jobs(AGENTS_TO_COMPARE, [scenario], range(NUM_EPISODES))
+        rows = []
+        for row in run_evaluation(jobs, num_workers=args.workers, out_path=args.out):
+            rows.append(row)
+            evaluation_results[row["agent"]][row["seed"]] = row["avg_wait"]
+            print(f"  Ep {row['seed'] + 1} {row['agent']}: Avg Wait {row['avg_wait']:.2f}, Delivered {row['delivered']}")
+        print("\n".join(summarize(rows)))
 
-# --- Plotting Results ---
-plt.style.use('seaborn-v0_8-darkgrid')
-fig, ax = plt.subplots(figsize=(12, 7))
+    # --- Plotting Results ---
+    plt.style.use('seaborn-v0_8-darkgrid')
+    fig, ax = plt.subplots(figsize=(12, 7))
 
-for name, avg_waits in evaluation_results.items():
-    if any(wait > 0 for wait in avg_waits): # Plot only if there is valid data
-        ax.plot(range(1, NUM_EPISODES + 1), avg_waits, label=name, marker='o', linestyle='-')
+    for name, avg_waits in evaluation_results.items():
+        if any(wait > 0 for wait in avg_waits): # Plot only if there is valid data
+            ax.plot(range(1, NUM_EPISODES + 1), avg_waits, label=name, marker='o', linestyle='-')
 
-ax.set_xlabel("Episode")
-ax.set_ylabel("Average Wait Time (s)")
-ax.set_title("Performance Evaluate with 0.0001 Learning Rate Agent: PPO vs. DQN vs. Rule-Based")
-ax.legend()
-fig.patch.set_facecolor('#f0f0f0')
-plt.tight_layout()
-plt.show()
+    ax.set_xlabel("Episode")
+    ax.set_ylabel("Average Wait Time (s)")
+    ax.set_title("Performance Evaluate with 0.0001 Learning Rate Agent: PPO vs. DQN vs. Rule-Based")
+    ax.legend()
+    fig.patch.set_facecolor('#f0f0f0')
+    plt.tight_layout()
+    plt.show()
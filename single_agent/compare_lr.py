@@ -3,6 +3,7 @@ from stable_baselines3 import PPO, DQN
 from single_agent_env import SingleAgentElevatorEnv
 from flatten_action_wrapper import FlattenActionWrapper
 from utils import evaluate_model
+from parallel_eval import Scenario, make_jobs, run_evaluation
 from pathlib import Path
 
 def evaluate(env, model, num_episodes, max_steps, deterministic=False, delay=0, render=True):
@@ -28,6 +29,18 @@ def compare_learning_rate(models, env, num_episodes, max_steps):
         results[name] = wait_times
     return results
 
+def compare_learning_rate_parallel(agents, num_episodes, max_steps, num_workers=None):
+    """
+    Like `compare_learning_rate`, but runs every (model, episode) job headless across a process pool.
+    `agents` are `AGENTS_TO_COMPARE`-style dicts named after their learning rate.
+    """
+    results = {agent["name"]: [-1] * num_episodes for agent in agents}
+    jobs = make_jobs(agents, [Scenario("default", sim_step_size=1.0, max_steps=max_steps)], range(num_episodes))
+    for row in run_evaluation(jobs, num_workers=num_workers):
+        results[row["agent"]][row["seed"]] = row["avg_wait"]
+        print(f"{row['agent']} Ep {row['seed'] + 1} Avg Wait {row['avg_wait']:.2f}, Delivered {row['delivered']}")
+    return results
+
 def plot_results(results, agent_name, num_episodes):
     """Plots the evaluation results."""
     plt.style.use('seaborn-v0_8-darkgrid')
@@ -52,19 +65,16 @@ if __name__ == '__main__':
     max_steps = 50000
     learning_rates = ["LR_00001","LR_00005","LR_0001"]
 
-    ppo_env = SingleAgentElevatorEnv(render_mode="human", sim_step_size=1.0)
-    dqn_env = FlattenActionWrapper(SingleAgentElevatorEnv(render_mode="human", sim_step_size=1.0))
-
     models_path = Path(__file__).parent.parent / "models" / "Single_agents"
 
-    ppo_models = {lr: PPO.load(models_path / lr / "ppo_elevator", env=ppo_env) for lr in learning_rates}
-    ppo_results = compare_learning_rate(ppo_models,ppo_env,num_episodes,max_steps)
-    plot_results(ppo_results, "PPO", num_episodes)
-
-
-    dqn_models = {lr: DQN.load(models_path / lr / "dqn_elevator", env=dqn_env) for lr in learning_rates}
-    dqn_results = compare_learning_rate(dqn_models,dqn_env,num_episodes,max_steps)
-    plot_results(dqn_results, "DQN", num_episodes)
+    for agent_name, loader, wrapper, file_name in (("PPO", PPO, None, "ppo_elevator"), ("DQN", DQN, FlattenActionWrapper, "dqn_elevator")):
+        agents = [
+            {"name": lr, "model_loader": loader, "model_path": str(models_path / lr / file_name),
+             "env_wrapper": wrapper, "eval_params": {"deterministic": False}}
+            for lr in learning_rates
+        ]
+        results = compare_learning_rate_parallel(agents, num_episodes, max_steps)
+        plot_results(results, agent_name, num_episodes)
     # plt.style.use('seaborn-v0_8-darkgrid')
     # fig, ax = plt.subplots(figsize=(12, 7))
 
@@ -36,3 +36,55 @@ class NormalAlgorithm:
 
         return np.array(actions)
 
+
+
+def stack_building_state(buildings):
+    """
+    Array-form state of a list of `Building`s for `VectorNormalAlgorithm`: car floors and
+    directions `[N, E]`, per-destination passenger counts `[N, E, F]` and the hall-call mask `[N, F]`.
+    """
+    floor = np.array([[e.floor for e in b.elevators] for b in buildings], dtype=np.int64)
+    direction = np.array([[e.direction for e in b.elevators] for b in buildings], dtype=np.int64)
+    passenger_counts = np.array(
+        [[[len(bucket) for bucket in e.passengers_by_dest] for e in b.elevators] for b in buildings], dtype=np.int64
+    )
+    hall_call_mask = np.array([[bool(q) for q in b.waiting_people] for b in buildings], dtype=bool)
+    return floor, direction, passenger_counts, hall_call_mask
+
+
+class VectorNormalAlgorithm:
+    """
+    `NormalAlgorithm` for many buildings at once, in one NumPy pass over array-form state.
+    Returns the same actions as `NormalAlgorithm.predict` for every building.
+    """
+
+    def actions(self, floor, direction, passenger_counts, hall_call_mask):
+        """
+        Actions `[N, E]` from car floors and directions `[N, E]`, per-destination
+        passenger counts `[N, E, F]` and the mask of floors with someone waiting `[N, F]`.
+        """
+        F = passenger_counts.shape[-1]
+        floors = np.arange(F)
+
+        # Cars with passengers head for the lowest destination going down, else the highest
+        onboard = passenger_counts > 0
+        has_passengers = onboard.any(axis=-1)
+        lowest = onboard.argmax(axis=-1)
+        highest = F - 1 - onboard[..., ::-1].argmax(axis=-1)
+        passenger_target = np.where(direction == -1, lowest, highest)
+
+        # Empty cars head for the nearest floor with a call, the lower one on ties
+        distance = np.abs(floors - floor[..., None])
+        distance = np.where(hall_call_mask[:, None, :], distance, F)
+        nearest_call = distance.argmin(axis=-1)
+        any_call = hall_call_mask.any(axis=-1)[:, None]
+
+        target = np.where(has_passengers, passenger_target, np.where(any_call, nearest_call, floor))
+        return np.where(floor < target, 1, np.where(floor > target, 2, 0))
+
+    def predict(self, building, *args, **kwargs):
+        """
+        Actions `[num_envs, num_elevators]` for every building of a `VectorBuilding`.
+        """
+        up, down = building.hall_calls()
+        return self.actions(building.floor, building.direction, building.passenger_counts(), (up + down) > 0)
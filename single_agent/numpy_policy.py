@@ -0,0 +1,185 @@
+import argparse
+
+import numpy as np
+
+# Activations of the exported MLP layers, by torch module name
+ACTIVATIONS = {
+    "Tanh": np.tanh,
+    "ReLU": lambda x: np.maximum(x, 0.0, out=x),
+}
+
+
+def _linear_layers(sequential):
+    """
+    (weight, bias) of every Linear layer of a torch Sequential, in order, and the activation name.
+    """
+    layers, activation = [], None
+    for module in sequential:
+        name = type(module).__name__
+        if name == "Linear":
+            layers.append((module.weight.detach().cpu().numpy(), module.bias.detach().cpu().numpy()))
+        elif name in ACTIVATIONS:
+            activation = name
+        else:
+            raise ValueError(f"Unsupported layer {name} in the policy network")
+    return layers, activation
+
+
+def _input_scale(features_extractor):
+    """
+    Per-input factors applied by the features extractor: None for `FlattenExtractor`,
+    the compact observation scale for `CompactObsExtractor`.
+    """
+    name = type(features_extractor).__name__
+    if name == "FlattenExtractor":
+        return None
+    if name == "CompactObsExtractor":
+        return features_extractor.scale.detach().cpu().numpy()
+    raise ValueError("Only MlpPolicy models (FlattenExtractor or CompactObsExtractor) can be exported")
+
+
+def export_policy(model_path, out_path, algo=None):
+    """
+    Extracts the actor (PPO), Q-network (DQN) or branching advantage heads (BDQ) weights of
+    a saved stable-baselines3 `MlpPolicy` model into a `.npz` file for `NumpyPolicy`.
+    `algo` is 'ppo', 'dqn' or 'bdq'; by default it is guessed from the file name.
+    """
+    from stable_baselines3 import PPO, DQN
+
+    if algo is None:
+        name = str(model_path).lower()
+        algo = "bdq" if "bdq" in name else "dqn" if "dqn" in name else "ppo"
+    algo = algo.lower()
+    if algo == "ppo":
+        model = PPO.load(model_path, device="cpu")
+        policy = model.policy
+        scale = _input_scale(policy.features_extractor)
+        layers, activation = _linear_layers(policy.mlp_extractor.policy_net)
+        layers.append((policy.action_net.weight.detach().cpu().numpy(), policy.action_net.bias.detach().cpu().numpy()))
+        nvec = np.asarray(model.action_space.nvec)
+        exploration_rate = 0.0
+    elif algo == "dqn":
+        model = DQN.load(model_path, device="cpu")
+        scale = _input_scale(model.q_net.features_extractor)
+        layers, activation = _linear_layers(model.q_net.q_net)
+        nvec = np.asarray([model.action_space.n])
+        exploration_rate = model.exploration_rate
+    elif algo == "bdq":
+        from branching_dqn import BranchingDQN
+        model = BranchingDQN.load(model_path, device="cpu")
+        q_net = model.q_net
+        scale = _input_scale(q_net.features_extractor)
+        layers, activation = _linear_layers(q_net.q_net)
+        # The greedy action of a branch only depends on its advantages
+        layers.append((q_net.advantage_net.weight.detach().cpu().numpy(), q_net.advantage_net.bias.detach().cpu().numpy()))
+        nvec = np.asarray(model.action_space.nvec)
+        exploration_rate = model.exploration_rate
+    else:
+        raise ValueError(f"Algorithm '{algo}' not supported. Choose from ['ppo', 'dqn', 'bdq']")
+
+    if scale is not None:
+        # Compact observations: fold the input normalization into the first layer
+        weight, bias = layers[0]
+        layers[0] = (weight * scale[None, :], bias)
+
+    arrays = {}
+    for i, (weight, bias) in enumerate(layers):
+        # Stored transposed, so the forward pass is x @ W + b on row-major batches
+        arrays[f"W{i}"] = np.ascontiguousarray(weight.T, dtype=np.float32)
+        arrays[f"b{i}"] = bias.astype(np.float32)
+    np.savez_compressed(
+        out_path,
+        algo=algo,
+        activation=activation or "Tanh",
+        num_layers=len(layers),
+        nvec=nvec,
+        exploration_rate=exploration_rate,
+        **arrays,
+    )
+
+
+class NumpyPolicy:
+    """
+    NumPy forward pass of an exported `MlpPolicy` (see `export_policy`), with the same
+    `predict` signature as stable-baselines3 models, for one observation or a batch.
+
+    PPO returns the mode of every MultiDiscrete head (or a sample with `deterministic=False`);
+    DQN returns the argmax Q-value action (epsilon-greedy at the exported exploration
+    rate with `deterministic=False`), i.e. the flat action `FlattenActionWrapper` expects.
+    BDQ returns the argmax advantage of every car's head (epsilon-greedy like DQN).
+    """
+
+    def __init__(self, layers, activation, algo, nvec, exploration_rate=0.0, seed=None):
+
+        self.layers = layers
+        self.activation = ACTIVATIONS[activation]
+        self.algo = algo
+        self.nvec = np.asarray(nvec)
+        self.exploration_rate = exploration_rate
+        self.splits = np.cumsum(self.nvec)[:-1]
+        self.rng = np.random.default_rng(seed)
+
+    @classmethod
+    def load(cls, path, seed=None, **kwargs):
+        """
+        Loads an exported `.npz` file. Other keyword arguments (e.g. `env`, `device`)
+        are accepted and ignored, so it can stand in for `PPO.load`/`DQN.load`.
+        """
+        with np.load(path) as data:
+            layers = [(data[f"W{i}"], data[f"b{i}"]) for i in range(int(data["num_layers"]))]
+            return cls(layers, str(data["activation"]), str(data["algo"]), data["nvec"], float(data["exploration_rate"]), seed)
+
+    def set_random_seed(self, seed=None):
+        self.rng = np.random.default_rng(seed)
+
+    def forward(self, obs):
+        """
+        Raw network output (PPO action logits or DQN Q-values) for a `[batch, obs_dim]` array.
+        """
+        x = np.asarray(obs, dtype=np.float32)
+        last = len(self.layers) - 1
+        for i, (weight, bias) in enumerate(self.layers):
+            x = x @ weight
+            x += bias
+            if i < last:
+                x = self.activation(x)
+        return x
+
+    def predict(self, observation, state=None, episode_start=None, deterministic=True):
+        """
+        Returns (actions, None) like `BaseAlgorithm.predict`.
+        """
+        obs = np.asarray(observation, dtype=np.float32)
+        single = obs.ndim == 1
+        if single:
+            obs = obs[None]
+        out = self.forward(obs)
+
+        if self.algo == "dqn":
+            actions = out.argmax(axis=1)
+            if not deterministic and self.exploration_rate > 0:
+                explore = self.rng.random(len(actions)) < self.exploration_rate
+                actions[explore] = self.rng.integers(self.nvec[0], size=int(explore.sum()))
+        else:
+            heads = np.split(out, self.splits, axis=1)
+            if not deterministic and self.algo == "ppo":
+                # Gumbel-max: a sample of each categorical head
+                heads = [logits + self.rng.gumbel(size=logits.shape) for logits in heads]
+            actions = np.stack([logits.argmax(axis=1) for logits in heads], axis=1)
+            if not deterministic and self.algo == "bdq" and self.exploration_rate > 0:
+                explore = self.rng.random(len(actions)) < self.exploration_rate
+                actions[explore] = self.rng.integers(self.nvec, size=(int(explore.sum()), len(self.nvec)))
+
+        return (actions[0] if single else actions), None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export a trained MlpPolicy model to a NumPy .npz policy.")
+    parser.add_argument("model_path", type=str, help="Saved model, e.g. models/Single_agents/LR_00005/ppo_elevator.zip")
+    parser.add_argument("--out", type=str, default=None, help="Output file (default: next to the model, .npz).")
+    parser.add_argument("--algo", type=str, default=None, choices=["ppo", "dqn", "bdq"], help="Default: guessed from the file name.")
+    args = parser.parse_args()
+
+    out_path = args.out or str(args.model_path).removesuffix(".zip") + ".npz"
+    export_policy(args.model_path, out_path, args.algo)
+    print(f"Exported policy to: {out_path}")
@@ -0,0 +1,239 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import csv
+import inspect
+import multiprocessing as mp
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from sim_config import SimConfig
+
+# Columns of the per-episode results table
+COLUMNS = (
+    "agent", "scenario", "seed", "steps", "delivered", "avg_wait",
+    "avg_pickup_wait_time", "avg_travel_time", "total_reward", "wall_time",
+)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """
+    One traffic scenario: simulation parameters, step size, decision interval, step limit and
+    an optional `PoissonArrivals` process (its keyword arguments; it is seeded with the job seed).
+    """
+    name: str
+    config: SimConfig | None = None  # None: ./params.json
+    sim_step_size: float = 1.0
+    decision_interval: int = 1
+    max_steps: int = 50000
+    arrivals: dict | None = field(default=None, compare=False)
+
+
+@dataclass(frozen=True)
+class EvalJob:
+    """
+    One episode: an agent spec (an `AGENTS_TO_COMPARE`-style dict), a scenario and a seed.
+    """
+    agent: dict
+    scenario: Scenario
+    seed: int
+
+
+def default_scenarios(config=None, max_steps=50000):
+    """
+    The standard comparison scenarios for `config`: the configured traffic,
+    the same traffic twice as dense, and up-peak traffic mostly leaving the lobby.
+    """
+    config = SimConfig.coerce(config)
+    F = config.num_floors
+    up_peak = np.ones((F, F))
+    up_peak[0, 1:] = 4 * F
+    np.fill_diagonal(up_peak, 0)
+    return [
+        Scenario("default", config, max_steps=max_steps),
+        Scenario("busy", config.replace(spawn_weight=[w / 2 for w in config.spawn_weight]), max_steps=max_steps),
+        Scenario("up-peak", config, max_steps=max_steps, arrivals={
+            "rates": config.spawn_rates, "slot_length": config.day_delay, "start_slot": 1, "od_matrix": up_peak,
+        }),
+    ]
+
+
+def make_jobs(agents, scenarios, seeds):
+    """
+    The full (agent x scenario x seed) matrix. Every agent gets the same seeds per scenario,
+    so they all see identical traffic.
+    """
+    return [EvalJob(agent, scenario, seed) for scenario in scenarios for seed in seeds for agent in agents]
+
+
+def _init_worker():
+    # Headless and single-threaded: parallelism comes from the pool
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    try:
+        import torch
+        torch.set_num_threads(1)
+    except ImportError:
+        pass
+
+
+# Trained models loaded by this worker process, by agent name and model path
+_models = {}
+
+
+def _load_model(agent, seed):
+    """
+    The agent's policy for one job. Trained models are frozen, so each is loaded once per
+    worker; rule-based dispatchers keep state between decisions (RNG, counters), so they are
+    built fresh, seeded with the job seed when the constructor takes one.
+    """
+    if not agent["model_path"]:
+        loader = agent["model_loader"]
+        if "seed" in inspect.signature(loader).parameters:
+            return loader(seed=seed)
+        return loader()
+
+    key = (agent["name"], agent["model_path"])
+    if key not in _models:
+        _models[key] = agent["model_loader"].load(agent["model_path"], device="cpu")
+    return _models[key]
+
+
+def run_job(job):
+    """
+    Runs one episode headless and returns its row of the results table.
+    """
+    from single_agent_env import SingleAgentElevatorEnv
+    from arrivals import PoissonArrivals
+    from utils import evaluate_model
+
+    agent, scenario = job.agent, job.scenario
+    model = _load_model(agent, job.seed)
+
+    env = SingleAgentElevatorEnv(render_mode=None, sim_step_size=scenario.sim_step_size, config=scenario.config,
+                                 decision_interval=scenario.decision_interval)
+    building = env.building
+    if scenario.arrivals is not None:
+        building.arrivals = PoissonArrivals(building.num_floors, seed=job.seed, **scenario.arrivals)
+    if agent["env_wrapper"]:
+        env = agent["env_wrapper"](env)
+
+    # The spawner draws from the global RNG; policies sample from NumPy/torch
+    random.seed(job.seed)
+    np.random.seed(job.seed)
+    if hasattr(model, "set_random_seed"):
+        model.set_random_seed(job.seed)
+
+    start = time.perf_counter()
+    info = evaluate_model(model, env, scenario.max_steps, delay=0, render=False,
+                          **{k: v for k, v in agent["eval_params"].items() if k == "deterministic"})
+    wall_time = time.perf_counter() - start
+    env.close()
+
+    delivered = building.delivered_people_count
+    return {
+        "agent": agent["name"],
+        "scenario": scenario.name,
+        "seed": job.seed,
+        "steps": info["steps"],
+        "delivered": delivered,
+        "avg_wait": building.total_wait_time / delivered if delivered else float("nan"),
+        "avg_pickup_wait_time": building.get_average_pickup_wait_time() if delivered else float("nan"),
+        "avg_travel_time": building.get_average_travel_time() if delivered else float("nan"),
+        "total_reward": float(info["total_reward"]),
+        "wall_time": wall_time,
+    }
+
+
+def run_evaluation(jobs, num_workers=None, out_path=None, start_method=None):
+    """
+    Runs `jobs` across a process pool and yields one result row per episode as it finishes.
+    With `out_path`, rows are also appended to a CSV file as they arrive.
+    """
+    num_workers = max(1, min(num_workers or os.cpu_count() or 1, len(jobs)))
+    if start_method is None:
+        start_method = "forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn"
+
+    out_file = None
+    writer = None
+    if out_path:
+        out_file = open(out_path, "w", newline="")
+        writer = csv.DictWriter(out_file, fieldnames=COLUMNS)
+        writer.writeheader()
+    try:
+        with ProcessPoolExecutor(num_workers, mp_context=mp.get_context(start_method), initializer=_init_worker) as pool:
+            futures = [pool.submit(run_job, job) for job in jobs]
+            for future in as_completed(futures):
+                row = future.result()
+                if writer:
+                    writer.writerow(row)
+                    out_file.flush()
+                yield row
+    finally:
+        if out_file:
+            out_file.close()
+
+
+def summarize(rows, metric="avg_wait"):
+    """
+    Mean and standard deviation of `metric` per (scenario, agent), as printable table lines.
+    """
+    groups = {}
+    for row in rows:
+        groups.setdefault((row["scenario"], row["agent"]), []).append(row[metric])
+    lines = [f"{'scenario':<12} {'agent':<14} {'episodes':>8} {metric + ' mean':>16} {'std':>8}"]
+    for (scenario, agent), values in sorted(groups.items()):
+        lines.append(f"{scenario:<12} {agent:<14} {len(values):>8} {np.nanmean(values):>16.3f} {np.nanstd(values):>8.3f}")
+    return lines
+
+
+def format_row(row):
+    return " ".join(f"{key}={row[key]:.3f}" if isinstance(row[key], float) else f"{key}={row[key]}" for key in COLUMNS)
+
+
+if __name__ == "__main__":
+    from normal_algorithm import NormalAlgorithm
+    from rollout_dispatcher import RolloutDispatcher
+    from classical_dispatchers import CollectiveDispatcher, UpPeakZoningDispatcher, ETADispatcher
+
+    rule_based = {
+        "Rule-Based": NormalAlgorithm,
+        "Rollout": RolloutDispatcher,
+        "Collective": CollectiveDispatcher,
+        "Zoning": UpPeakZoningDispatcher,
+        "ETA": ETADispatcher,
+    }
+
+    parser = argparse.ArgumentParser(description="Evaluate dispatchers over (agent x seed x scenario) jobs in parallel.")
+    parser.add_argument("--agents", nargs="+", default=list(rule_based), choices=list(rule_based))
+    parser.add_argument("--seeds", type=int, default=10, help="Episodes per agent and scenario (seeds 0..N-1).")
+    parser.add_argument("--scenarios", nargs="+", default=None, help="Scenario names (default: all).")
+    parser.add_argument("--max-steps", type=int, default=50000)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per core).")
+    parser.add_argument("--out", type=str, default=None, help="CSV file for the per-episode table.")
+    parser.add_argument("--config", type=str, default="params.json", help="Path to the simulation parameters file.")
+    args = parser.parse_args()
+
+    agents = [
+        {"name": name, "model_loader": rule_based[name], "model_path": None, "env_wrapper": None, "eval_params": {}}
+        for name in args.agents
+    ]
+    scenarios = default_scenarios(SimConfig.from_json(args.config), max_steps=args.max_steps)
+    if args.scenarios:
+        scenarios = [s for s in scenarios if s.name in args.scenarios]
+
+    jobs = make_jobs(agents, scenarios, range(args.seeds))
+    start = time.perf_counter()
+    rows = []
+    for row in run_evaluation(jobs, num_workers=args.workers, out_path=args.out):
+        rows.append(row)
+        print(format_row(row))
+    print(f"\n{len(rows)} episodes in {time.perf_counter() - start:.1f}s\n")
+    print("\n".join(summarize(rows)))
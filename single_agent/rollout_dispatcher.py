@@ -0,0 +1,132 @@
+import itertools
+import random
+import time
+
+import numpy as np
+
+from normal_algorithm import NormalAlgorithm
+
+
+class RolloutDispatcher:
+    """
+    Rollout (one-step lookahead) dispatcher with a hard time budget per decision.
+
+    Each candidate joint action is applied for one step from a `Building.snapshot()`,
+    then `NormalAlgorithm` drives all cars for the rest of a short horizon while people
+    spawn from the building's own arrival model with a sampled random seed: the attached
+    arrival process forked with `fork(seed)` (a `PoissonArrivals` redraws everything after
+    its last `pop_until`, a `TraceSpawner` replays its recorded future), or `spawn_people` without one. The
+    candidate with the lowest mean person-time in the system (waiting plus riding,
+    the quantity behind `avg_wait`) is chosen.
+
+    Rollouts run in rounds: each round evaluates every candidate on the same sampled
+    arrivals, greedy action and single-car deviations first. When the budget runs out,
+    the decision uses the completed rounds, or the candidates reached in the first round,
+    or the greedy action. The building, its RNG and arrival process are restored afterwards.
+
+    Used like `NormalAlgorithm`: `predict(building)` returns one action per car.
+    """
+
+    def __init__(self, time_budget=0.005, horizon=10, num_samples=8, max_candidates=None, seed=None):
+
+        self.time_budget = time_budget  # Seconds per decision
+        self.horizon = horizon  # Steps per rollout, the candidate step included
+        self.num_samples = num_samples  # Upper bound on rounds per decision
+        self.max_candidates = max_candidates  # None: greedy and single-car deviations only
+        self.base_policy = NormalAlgorithm()
+        self.rng = random.Random(seed)
+
+        # Reporting: decisions taken, rollouts run, rounds completed
+        self.decisions = 0
+        self.rollouts = 0
+        self.rounds = 0
+
+    def _candidates(self, greedy):
+        """
+        Greedy action, then every single-car deviation from it, then (with `max_candidates`
+        set) the remaining combinations, up to `max_candidates` in total.
+        """
+        greedy = tuple(int(action) for action in greedy)
+        candidates = [greedy]
+        for car, action in itertools.product(range(len(greedy)), range(3)):
+            if action != greedy[car]:
+                candidates.append(greedy[:car] + (action,) + greedy[car + 1:])
+        if self.max_candidates is None:
+            return candidates
+        if 3 ** len(greedy) <= self.max_candidates:
+            seen = set(candidates)
+            candidates += [c for c in itertools.product(range(3), repeat=len(greedy)) if c not in seen]
+        return candidates[:self.max_candidates]
+
+    def _rollout(self, building, snap, first_action, sample_seed, arrivals_state):
+        """
+        Runs one rollout from `snap` and returns its person-time in the system.
+        `arrivals_state` is the start state of the round's forked arrival process, if any.
+        """
+        building.restore(snap)
+        random.seed(sample_seed)
+        if arrivals_state is not None:
+            building.arrivals.set_state(arrivals_state)
+
+        cost = 0.0
+        action = first_action
+        for step in range(self.horizon):
+            if step:
+                action = self.base_policy.predict(building)
+            building.step(action)
+            riding = sum(len(elevator.passengers) for elevator in building.elevators)
+            cost += (building.num_waiting + riding) * building.sim_step_size
+        return cost
+
+    def predict(self, building, *args, **kwargs):
+        """
+        Returns the action per car with the lowest expected person-time in the system.
+        """
+        deadline = time.perf_counter() + self.time_budget
+        greedy = self.base_policy.predict(building)
+        candidates = self._candidates(greedy)
+        self.decisions += 1
+
+        # Rollouts run on a forked arrival process per round; the real one is put back with the snapshot
+        arrivals = building.arrivals
+        snap = building.snapshot()
+
+        totals = np.zeros(len(candidates))
+        round_costs = np.full(len(candidates), np.inf)
+        completed = 0
+        rollout_time = 0.0
+        rollouts = 0
+        try:
+            for _ in range(self.num_samples):
+                sample_seed = self.rng.getrandbits(32)
+                arrivals_state = None
+                if arrivals is not None:
+                    building.arrivals = arrivals.fork(sample_seed)
+                    arrivals_state = building.arrivals.get_state()
+                round_costs[:] = np.inf
+                for i, candidate in enumerate(candidates):
+                    now = time.perf_counter()
+                    # Stop before a rollout that would overrun the budget
+                    if now + (rollout_time / rollouts if rollouts else 0.0) > deadline:
+                        raise TimeoutError
+                    round_costs[i] = self._rollout(building, snap, candidate, sample_seed, arrivals_state)
+                    rollout_time += time.perf_counter() - now
+                    rollouts += 1
+                # Only complete rounds count, so every candidate is scored on the same samples
+                totals += round_costs
+                completed += 1
+        except TimeoutError:
+            pass
+        finally:
+            building.arrivals = arrivals
+            building.restore(snap)
+            self.rollouts += rollouts
+            self.rounds += completed
+
+        if completed:
+            best = int(np.argmin(totals))
+        elif rollouts:
+            best = int(np.argmin(round_costs))
+        else:
+            return greedy
+        return np.array(candidates[best])
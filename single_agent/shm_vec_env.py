@@ -0,0 +1,290 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import multiprocessing as mp
+import random
+from multiprocessing import shared_memory
+
+from gymnasium import spaces
+import numpy as np
+from stable_baselines3.common.vec_env import VecEnv
+
+from observation import compact_obs_dtype
+from sim_config import SimConfig
+
+# Control messages, the only thing sent through the pipes
+STEP, RESET, CLOSE, READY = b's', b'r', b'c', b'k'
+
+# Per-env metrics written by the workers when an episode ends
+METRICS = ("delivered", "avg_wait", "avg_pickup_wait_time", "avg_travel_time")
+
+
+def _shared_arrays(buffer, num_envs, obs_size, num_elevators, obs_dtype=np.float32):
+    """
+    Lays out the NumPy views over the shared memory block, identically in the main process and the workers.
+    """
+    layout = [
+        ('obs', obs_dtype, (num_envs, obs_size)),
+        ('terminal_obs', obs_dtype, (num_envs, obs_size)),
+        ('metrics', np.float64, (num_envs, len(METRICS))),
+        ('rewards', np.float32, (num_envs,)),
+        ('actions', np.int64, (num_envs, num_elevators)),
+        ('dones', np.bool_, (num_envs,)),
+        ('action_masks', np.bool_, (num_envs, num_elevators * 3)),
+        ('seeds', np.int64, (num_envs,)),  # For the next RESET, -1 for none
+    ]
+    arrays = {}
+    offset = 0
+    for name, dtype, shape in layout:
+        array = np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset)
+        arrays[name] = array
+        offset += array.nbytes
+        offset += -offset % 8  # Keep every array 8-byte aligned
+    return arrays, offset
+
+
+def _worker(conn, shm_name, env_slice, num_envs, config, sim_step_size, core, seed, compact_obs, decision_interval):
+    """
+    Hosts the sub-environments of `env_slice` and steps them on every control message,
+    reading actions from and writing results to the shared memory block.
+    """
+    # Headless: no window, no audio device
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    if core is not None and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {core})
+    if seed is not None:
+        random.seed(seed)
+
+    from single_agent_env import SingleAgentElevatorEnv
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    envs = [SingleAgentElevatorEnv(render_mode=None, sim_step_size=sim_step_size, config=config, compact_obs=compact_obs,
+                                   decision_interval=decision_interval)
+            for _ in env_slice]
+    arrays, _ = _shared_arrays(shm.buf, num_envs, config.obs_size, config.num_elevators, envs[0].observation_space.dtype)
+    obs, terminal_obs, metrics = arrays['obs'], arrays['terminal_obs'], arrays['metrics']
+    rewards, actions, dones = arrays['rewards'], arrays['actions'], arrays['dones']
+    masks, seeds = arrays['action_masks'], arrays['seeds']
+    conn.send_bytes(READY)
+
+    try:
+        while True:
+            try:
+                command = conn.recv_bytes()
+            except EOFError:
+                # The main process is gone without closing us: shut down like on CLOSE
+                break
+            if command == STEP:
+                for env, i in zip(envs, env_slice):
+                    env_obs, reward, terminated, truncated, info = env.step(actions[i])
+                    rewards[i] = reward
+                    dones[i] = terminated or truncated
+                    if dones[i]:
+                        terminal_obs[i] = env_obs
+                        metrics[i] = [info[key] for key in METRICS]
+                        env_obs, _ = env.reset()
+                    obs[i] = env_obs
+                    masks[i] = env.action_masks()
+            elif command == RESET:
+                for env, i in zip(envs, env_slice):
+                    obs[i], _ = env.reset(seed=int(seeds[i]) if seeds[i] >= 0 else None)
+                    masks[i] = env.action_masks()
+            elif command == CLOSE:
+                break
+            conn.send_bytes(READY)
+    finally:
+        for env in envs:
+            env.close()
+        del obs, terminal_obs, metrics, rewards, actions, dones, masks, seeds, arrays
+        shm.close()
+        conn.close()
+
+
+class SharedMemoryVecEnv(VecEnv):
+    """
+    Multiprocessing VecEnv for `SingleAgentElevatorEnv` that exchanges observations,
+    rewards and done flags through `multiprocessing.shared_memory` instead of pickling them.
+
+    Each worker process hosts a contiguous slice of the sub-environments, is pinned to
+    one core (on platforms with `os.sched_setaffinity`) and runs headless. Per step, the
+    main process writes the actions into shared memory and sends every worker a one-byte
+    control message. With `flatten_actions=True` the action space is `Discrete(3 ** num_elevators)`
+    like `FlattenActionWrapper`, for DQN. With `compact_obs=True` the shared observations
+    are integer counts like `SingleAgentElevatorEnv(compact_obs=True)`. `decision_interval`
+    is passed on to the sub-environments. The workers also share the valid per-car actions
+    of every sub-environment, read by `action_masks()` for sb3-contrib's `MaskablePPO`.
+    """
+
+    def __init__(self, num_envs, num_workers=None, sim_step_size=1.0, flatten_actions=False, seed=None, start_method=None,
+                 config=None, compact_obs=False, decision_interval=1):
+        self.render_mode = None
+        # Resolved once here and pickled to the workers, which never read params.json
+        self.config = SimConfig.coerce(config)
+        num_elevators = self.config.num_elevators
+        obs_size = self.config.obs_size
+
+        self.nvec = np.full(num_elevators, 3)
+        self.flatten_actions = flatten_actions
+        if compact_obs:
+            obs_dtype = compact_obs_dtype(self.config.num_floors, self.config.elevator_capacity)
+            observation_space = spaces.Box(low=0, high=np.iinfo(obs_dtype).max, shape=(obs_size,), dtype=obs_dtype)
+        else:
+            obs_dtype = np.float32
+            observation_space = spaces.Box(low=-np.inf, high=np.inf, shape=(obs_size,), dtype=np.float32)
+        if flatten_actions:
+            action_space = spaces.Discrete(int(self.nvec.prod()))
+        else:
+            action_space = spaces.MultiDiscrete(self.nvec)
+        super().__init__(num_envs, observation_space, action_space)
+
+        # Set up before anything can fail, so close() (also run by __del__) can clean up partially
+        self.closed = False
+        self.remotes = []
+        self.processes = []
+        self._arrays = None
+        self._shm = None
+
+        _, size = _shared_arrays(None, num_envs, obs_size, num_elevators, obs_dtype)
+        self._shm = shared_memory.SharedMemory(create=True, size=size)
+        self._arrays, _ = _shared_arrays(self._shm.buf, num_envs, obs_size, num_elevators, obs_dtype)
+        self._obs_copies = np.zeros((2, num_envs, obs_size), dtype=obs_dtype)
+        self._current = 0
+
+        if start_method is None:
+            start_method = "forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn"
+        ctx = mp.get_context(start_method)
+
+        num_workers = min(num_workers or os.cpu_count() or 1, num_envs)
+        cores = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else None
+        for w, env_slice in enumerate(np.array_split(np.arange(num_envs), num_workers)):
+            remote, work_remote = ctx.Pipe()
+            core = cores[w % len(cores)] if cores else None
+            worker_seed = None if seed is None else seed + w
+            args = (work_remote, self._shm.name, env_slice.tolist(), num_envs, self.config, sim_step_size, core, worker_seed,
+                    compact_obs, decision_interval)
+            process = ctx.Process(target=_worker, args=args, daemon=True)
+            process.start()
+            work_remote.close()
+            self.remotes.append(remote)
+            self.processes.append(process)
+
+        for remote in self.remotes:
+            remote.recv_bytes()
+
+    def _broadcast(self, command):
+        for remote in self.remotes:
+            remote.send_bytes(command)
+        for remote in self.remotes:
+            remote.recv_bytes()
+
+    def _copy_obs(self):
+        # SB3 keeps the previous batch around, so hand out alternating copies of the shared observations
+        self._current ^= 1
+        out = self._obs_copies[self._current]
+        out[:] = self._arrays['obs']
+        return out
+
+    def reset(self):
+        # Seeds from seed() apply to this reset only, like SubprocVecEnv
+        self._arrays['seeds'][:] = [-1 if seed is None else seed for seed in self._seeds]
+        self._reset_seeds()
+        self._broadcast(RESET)
+        self.reset_infos = [{} for _ in range(self.num_envs)]
+        return self._copy_obs()
+
+    def step_async(self, actions):
+        actions = np.asarray(actions)
+        if self.flatten_actions:
+            actions = np.stack(np.unravel_index(actions.reshape(self.num_envs), self.nvec), axis=1)
+        self._arrays['actions'][:] = actions.reshape(self.num_envs, -1)
+        for remote in self.remotes:
+            remote.send_bytes(STEP)
+
+    def step_wait(self):
+        for remote in self.remotes:
+            remote.recv_bytes()
+
+        dones = self._arrays['dones'].copy()
+        infos = [{} for _ in range(self.num_envs)]
+        for i in np.flatnonzero(dones).tolist():
+            infos[i] = dict(zip(METRICS, self._arrays['metrics'][i].tolist()))
+            infos[i]["delivered"] = int(infos[i]["delivered"])
+            infos[i]["terminal_observation"] = self._arrays['terminal_obs'][i].copy()
+            infos[i]["TimeLimit.truncated"] = False
+
+        return self._copy_obs(), self._arrays['rewards'].copy(), dones, infos
+
+    def action_masks(self):
+        """Valid actions as a `[num_envs, num_elevators * 3]` bool array, as of the last step or reset."""
+        return self._arrays['action_masks'].copy()
+
+    def close(self):
+        """
+        Stops the workers and frees the shared memory. Safe to call more than once, after a
+        failed `__init__` and from `__del__`, also when workers have already exited.
+        """
+        if getattr(self, "closed", True):
+            return
+        self.closed = True
+        for remote in self.remotes:
+            try:
+                remote.send_bytes(CLOSE)
+            except OSError:
+                pass  # Worker already gone
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        for remote in self.remotes:
+            remote.close()
+        self._arrays = None
+        if self._shm is not None:
+            self._shm.close()
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+            self._shm = None
+
+    def __del__(self):
+        self.close()
+
+    def get_images(self):
+        return []
+
+    def _indices(self, indices):
+        if indices is None:
+            return range(self.num_envs)
+        if isinstance(indices, int):
+            return [indices]
+        return indices
+
+    def _all_indices(self, indices, what):
+        # Only the main-process object is reachable: its attributes and methods are shared by every sub-env
+        indices = self._indices(indices)
+        if set(indices) != set(range(self.num_envs)):
+            raise ValueError(f"{type(self).__name__} cannot {what} for a subset of its sub-environments")
+        return indices
+
+    def get_attr(self, attr_name, indices=None):
+        # The same value for every sub-env, one entry per index
+        value = getattr(self, attr_name)
+        return [value] * len(self._indices(indices))
+
+    def set_attr(self, attr_name, value, indices=None):
+        self._all_indices(indices, f"set '{attr_name}'")
+        setattr(self, attr_name, value)
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        if method_name == "action_masks":
+            # Written by the workers for all sub-envs, handed out per sub-env
+            return list(self.action_masks()[list(self._indices(indices))])
+        indices = self._all_indices(indices, f"call '{method_name}'")
+        result = getattr(self, method_name)(*method_args, **method_kwargs)
+        return [result] * len(indices)
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False for _ in self._indices(indices)]
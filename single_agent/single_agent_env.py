@@ -2,6 +2,8 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import random
+
 import gymnasium as gym
 from gymnasium import spaces
 import numpy as np
@@ -9,45 +11,62 @@ import numpy as np
 from base_env import BaseElevatorEnv
 
 class SingleAgentElevatorEnv(gym.Env, BaseElevatorEnv):
-    def __init__(self, render_mode=None, sim_step_size=1.0):
+
+    metadata = {"render_modes": ["human", "rgb_array"]}
+
+    # gym.Env comes first in the MRO, so take rendering and cleanup from the base explicitly
+    render = BaseElevatorEnv.render
+    close = BaseElevatorEnv.close
+
+    def __init__(self, render_mode=None, sim_step_size=1.0, config=None, compact_obs=False, decision_interval=1):
         # Initialize the base environment
-        BaseElevatorEnv.__init__(self, render_mode=render_mode, sim_step_size=sim_step_size)
+        BaseElevatorEnv.__init__(self, render_mode=render_mode, sim_step_size=sim_step_size, config=config,
+                                 compact_obs=compact_obs, decision_interval=decision_interval)
         
         # Define Gym-specific action and observation spaces
         self.action_space = spaces.MultiDiscrete([3] * self.num_elevators)
         
-        elevator_state_size = self.num_elevators * (1 + 3 + self.num_floors)
-        waiting_size = self.num_floors * 2 
-        self.observation_space = spaces.Box(
-            low=-np.inf, 
-            high=np.inf, 
-            shape=(elevator_state_size + waiting_size,), 
-            dtype=np.float32
-        )
+        if compact_obs:
+            # Integer counts; CompactObsExtractor normalizes them inside the policy
+            dtype = self.obs_writer.dtype
+            self.observation_space = spaces.Box(low=0, high=np.iinfo(dtype).max, shape=(self.obs_writer.size,), dtype=dtype)
+        else:
+            self.observation_space = spaces.Box(
+                low=-np.inf, 
+                high=np.inf, 
+                shape=(self.obs_writer.size,), 
+                dtype=np.float32
+            )
 
     def reset(self, seed=None, options=None):
+        if seed is not None:
+            # The spawner draws from the global RNG
+            random.seed(seed)
         super().reset_building()
         obs = self._get_obs()
         info = {}
         return obs, info
 
-    def step(self, action):
-        actions = action.tolist()
-        _, update_infos, done, _ = self.building.step(actions)
-        
+    def _tick_reward(self, update_infos):
         total_reward = 0
         
         for i, info in enumerate(update_infos):
             reward = 0
-            if info['is_idle'] and (any(self.building.waiting_people) or info['num_passengers'] > 0):
+            if info['is_idle'] and (self.building.num_waiting > 0 or info['num_passengers'] > 0):
                 reward -= 1.0
             reward += 50.0 * info['passengers_dropped_off']
             reward += 10.0 * info['passengers_picked_up']
             reward -= 0.05 * info['num_passengers']
             total_reward += reward
 
-        num_waiting_on_floors = sum(len(q) for q in self.building.waiting_people)
+        num_waiting_on_floors = self.building.num_waiting
         total_reward -= 0.05 * num_waiting_on_floors
+        return total_reward
+
+    def step(self, action):
+        actions = action.tolist()
+        # One tick, or several with a decision_interval (rewards summed over them)
+        _, total_reward, done, ticks = self._step_interval(actions, self._tick_reward)
         
         obs = self._get_obs()
         
@@ -65,14 +84,15 @@ class SingleAgentElevatorEnv(gym.Env, BaseElevatorEnv):
             "delivered": delivered_count, 
             "avg_wait": avg_wait,
             "avg_pickup_wait_time": avg_pickup_wait_time,
-            "avg_travel_time": avg_travel_time
+            "avg_travel_time": avg_travel_time,
+            "ticks": ticks
         }
         return obs, total_reward, done, False, info
 
-    def _get_obs(self):
-        elevator_states = [self._get_local_obs_part(i) for i in range(self.num_elevators)]
-        global_state = self._get_global_obs_part()
-        
-        # For single-agent, flatten everything into one vector
-        obs = np.concatenate(elevator_states + [global_state])
-        return obs
+    def action_masks(self):
+        # For sb3-contrib's MaskablePPO: one (idle, up, down) block per car, concatenated
+        return self._action_mask().reshape(-1)
+
+    def _get_obs(self, out=None):
+        # For single-agent, everything is flattened into one vector (float32 or compact counts), written in place
+        return self.obs_writer.write(out)
@@ -1,38 +1,80 @@
 import argparse
-import json
 import os
 from pathlib import Path
 
 from stable_baselines3 import PPO, DQN
 from stable_baselines3.common.env_util import make_vec_env
 from stable_baselines3.common.callbacks import CheckpointCallback
+from stable_baselines3.common.vec_env import VecMonitor
+
+try:
+    from sb3_contrib import MaskablePPO
+except ImportError:  # Only needed for --algo maskppo
+    MaskablePPO = None
 
 from single_agent_env import SingleAgentElevatorEnv
 from flatten_action_wrapper import FlattenActionWrapper
+from branching_dqn import BranchingDQN
+from vector_env import VectorElevatorEnv
+from shm_vec_env import SharedMemoryVecEnv
+from compact_obs import compact_obs_policy_kwargs
+from sim_config import SimConfig
 
-def train_agent(algo, lr, total_timesteps):
+def train_agent(algo, lr, total_timesteps, n_envs=4, vec_env="dummy", config=None, compact_obs=False,
+                sim_step_size=1.0, decision_interval=1):
     """
     Trains a single-agent reinforcement learning model.
 
     Args:
-        algo (str): The algorithm to use ('ppo' or 'dqn').
+        algo (str): The algorithm to use ('ppo', 'maskppo', 'dqn' or 'bdq'). 'maskppo' is
+            sb3-contrib's MaskablePPO, which never samples moves past the top or bottom floor.
+            'dqn' flattens the actions into one Discrete(3 ** num_elevators) head; 'bdq'
+            (branching DQN) keeps one Q-value head per car, so it scales to many elevators.
         lr (float): The learning rate.
         total_timesteps (int): The total number of training timesteps.
+        n_envs (int): The number of parallel environments.
+        vec_env (str): How the environments are stepped: 'dummy' (DummyVecEnv of
+            SingleAgentElevatorEnv), 'native' (one batched VectorElevatorEnv) or
+            'shm' (SharedMemoryVecEnv worker processes, one per core).
+        config (SimConfig | str | None): Simulation parameters, or a path to a params.json
+            file. Defaults to ./params.json.
+        compact_obs (bool): Observe uint8/uint16 counts, normalized by the policy's features
+            extractor. DQN/BDQ then keep the compact form in a memory-optimized replay buffer.
+        sim_step_size (float): Simulated seconds per tick.
+        decision_interval (int): Repeat each action for up to this many ticks, until a car
+            reaches a floor, is stopped at the end of its shaft or a new passenger arrives.
+            Not supported by the 'native' vec env.
     """
     
     algo_map = {
         "ppo": (PPO, None),
-        "dqn": (DQN, FlattenActionWrapper)
+        "maskppo": (MaskablePPO, None),
+        "dqn": (DQN, FlattenActionWrapper),
+        "bdq": (BranchingDQN, None)
     }
 
     if algo.lower() not in algo_map:
         raise ValueError(f"Algorithm '{algo}' not supported. Choose from {list(algo_map.keys())}")
 
     model_class, wrapper = algo_map[algo.lower()]
+    if model_class is None:
+        raise ImportError(f"Algorithm '{algo}' needs sb3-contrib: pip install sb3-contrib")
     
     # --- Environment Setup ---
-    env_kwargs = {"render_mode": None, "sim_step_size": 1.0}
-    env = make_vec_env(SingleAgentElevatorEnv, n_envs=4, env_kwargs=env_kwargs, wrapper_class=wrapper)
+    config = SimConfig.coerce(config)
+    flatten_actions = wrapper is FlattenActionWrapper
+    if vec_env == "native":
+        if decision_interval > 1:
+            raise ValueError("The 'native' vec env steps one tick at a time; use 'dummy' or 'shm' with a decision interval")
+        env = VecMonitor(VectorElevatorEnv(n_envs, sim_step_size=sim_step_size, flatten_actions=flatten_actions, config=config,
+                                           compact_obs=compact_obs))
+    elif vec_env == "shm":
+        env = VecMonitor(SharedMemoryVecEnv(n_envs, sim_step_size=sim_step_size, flatten_actions=flatten_actions, config=config,
+                                            compact_obs=compact_obs, decision_interval=decision_interval))
+    else:
+        env_kwargs = {"render_mode": None, "sim_step_size": sim_step_size, "config": config, "compact_obs": compact_obs,
+                      "decision_interval": decision_interval}
+        env = make_vec_env(SingleAgentElevatorEnv, n_envs=n_envs, env_kwargs=env_kwargs, wrapper_class=wrapper)
 
     # --- Paths and Callbacks ---
     model_dir = Path(f"models/Single_agents/LR_{str(lr).split('.')[-1]}")
@@ -48,7 +90,7 @@ def train_agent(algo, lr, total_timesteps):
     
     # --- Model Hyperparameters ---
     # Using default hyperparameters from the original scripts for now
-    if algo.lower() == "ppo":
+    if algo.lower() in ("ppo", "maskppo"):
         model_params = {
             "learning_rate": lr,
             "n_steps": 2048,
@@ -58,7 +100,7 @@ def train_agent(algo, lr, total_timesteps):
             "ent_coef": 0.02,
             "clip_range": 0.2,
         }
-    else: # dqn
+    else: # dqn, bdq
         model_params = {
             "learning_rate": lr,
             "buffer_size": 1_000_000,
@@ -71,26 +113,38 @@ def train_agent(algo, lr, total_timesteps):
             "exploration_final_eps": 0.05,
             "policy_kwargs": dict(net_arch=[256, 256]),
         }
+        if compact_obs:
+            # Next observations are read from the following slot instead of stored twice.
+            # The env never truncates, so no timeout bookkeeping is needed
+            model_params["optimize_memory_usage"] = True
+            model_params["replay_buffer_kwargs"] = dict(handle_timeout_termination=False)
+
+    if compact_obs:
+        model_params["policy_kwargs"] = {**model_params.get("policy_kwargs", {}), **compact_obs_policy_kwargs(config)}
 
     # --- Model Initialization and Training ---
-    model = model_class(
-        "MlpPolicy",
-        env,
-        verbose=1,
-        tensorboard_log=str(log_dir),
-        **model_params
-    )
+    # Worker processes and shared memory (vec_env="shm") are released even if training fails
+    try:
+        model = model_class(
+            "MlpPolicy",
+            env,
+            verbose=1,
+            tensorboard_log=str(log_dir),
+            **model_params
+        )
 
-    print(f"\n--- Starting Training for {algo.upper()} with LR={lr} ---")
-    model.learn(
-        total_timesteps=total_timesteps,
-        callback=checkpoint_callback,
-        tb_log_name=f"{algo.upper()}_{lr}"
-    )
+        print(f"\n--- Starting Training for {algo.upper()} with LR={lr} ---")
+        model.learn(
+            total_timesteps=total_timesteps,
+            callback=checkpoint_callback,
+            tb_log_name=f"{algo.upper()}_{lr}"
+        )
 
-    # --- Save Final Model ---
-    final_model_path = model_dir / f"{algo.lower()}_elevator.zip"
-    model.save(final_model_path)
+        # --- Save Final Model ---
+        final_model_path = model_dir / f"{algo.lower()}_elevator.zip"
+        model.save(final_model_path)
+    finally:
+        env.close()
     
     print("\n--- Training Complete ---")
     print(f"Final model saved to: {final_model_path}")
@@ -101,10 +155,20 @@ def train_agent(algo, lr, total_timesteps):
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description="Train a reinforcement learning agent for the Smart Elevator.")
-    parser.add_argument("--algo", type=str, required=True, help="Algorithm to use ('ppo' or 'dqn')")
+    parser.add_argument("--algo", type=str, required=True, help="Algorithm to use ('ppo', 'maskppo', 'dqn' or 'bdq')")
     parser.add_argument("--lr", type=float, required=True, help="Learning rate for the optimizer.")
     parser.add_argument("--timesteps", type=int, required=True, help="Total number of training timesteps.")
+    parser.add_argument("--n-envs", type=int, default=4, help="Number of parallel environments.")
+    parser.add_argument("--vec-env", type=str, default="dummy", choices=["dummy", "native", "shm"],
+                        help="'native' batches all envs in one simulator, 'shm' runs them in shared-memory worker processes.")
+    parser.add_argument("--config", type=str, default="params.json", help="Path to the simulation parameters file.")
+    parser.add_argument("--compact-obs", action="store_true",
+                        help="Integer observations normalized in the policy; smaller (replay) buffers.")
+    parser.add_argument("--sim-step-size", type=float, default=1.0, help="Simulated seconds per tick.")
+    parser.add_argument("--decision-interval", type=int, default=1,
+                        help="Query the agent at most every N ticks, or earlier when a car reaches a floor.")
     
     args = parser.parse_args()
     
-    train_agent(args.algo, args.lr, args.timesteps)
+    train_agent(args.algo, args.lr, args.timesteps, args.n_envs, args.vec_env, SimConfig.from_json(args.config), args.compact_obs,
+                args.sim_step_size, args.decision_interval)
@@ -1,10 +1,17 @@
-import pygame
+import inspect
 import time
 import numpy as np
-from .normal_algorithm import NormalAlgorithm
+from normal_algorithm import NormalAlgorithm
+from rollout_dispatcher import RolloutDispatcher
+from classical_dispatchers import CollectiveDispatcher, UpPeakZoningDispatcher, ETADispatcher
+
+# Dispatchers that read the building directly instead of the observation
+BUILDING_DISPATCHERS = (NormalAlgorithm, RolloutDispatcher, CollectiveDispatcher, UpPeakZoningDispatcher, ETADispatcher)
 
 def evaluate_model(model, env, max_steps, deterministic=False,delay = 0.1,render = True):
-    is_rule_based = isinstance(model, NormalAlgorithm)
+    is_rule_based = isinstance(model, BUILDING_DISPATCHERS)
+    # sb3-contrib's MaskablePPO takes the env's valid actions with every prediction
+    uses_masks = not is_rule_based and "action_masks" in inspect.signature(model.predict).parameters
 
 
     obs, _ = env.reset()
@@ -12,21 +19,27 @@ def evaluate_model(model, env, max_steps, deterministic=False,delay = 0.1,render
 
     info = {}
     while not done and steps < max_steps:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                done = True
+        if render and env.render_mode == "human":
+            import pygame
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    done = True
         if done:
             break
         if is_rule_based:
             action = model.predict(env.building)
             obs, reward, done, _, info = env.step(action)
+        elif uses_masks:
+            action, _ = model.predict(obs, deterministic=deterministic, action_masks=env.action_masks())
+            obs, reward, done, _, info = env.step(action)
         else:
             action, _ = model.predict(obs, deterministic=deterministic)
             obs, reward, done, _, info = env.step(action)
 
         if render:
             env.render()
-        time.sleep(delay)
+        if delay > 0:
+            time.sleep(delay)
 
         total_reward += reward
         steps += 1
@@ -35,4 +48,4 @@ def evaluate_model(model, env, max_steps, deterministic=False,delay = 0.1,render
     # if not done:
     #     _, _, _, _, info = env.step(action)
 
-    return info
+    return dict(info, steps=steps, total_reward=total_reward)
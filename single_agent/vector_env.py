@@ -0,0 +1,152 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gymnasium import spaces
+import numpy as np
+from stable_baselines3.common.vec_env import VecEnv
+
+from action_mask import action_mask
+from observation import VectorObservationWriter
+from sim_config import SimConfig
+from vector_building import VectorBuilding
+
+
+class VectorElevatorEnv(VecEnv):
+    """
+    Native stable-baselines3 VecEnv for the single-agent elevator problem.
+
+    All sub-environments live in one `VectorBuilding` and are stepped, rewarded,
+    observed and auto-reset in a single batched call, with the same rewards and
+    observations as `SingleAgentElevatorEnv`. With `flatten_actions=True` the action
+    space is `Discrete(3 ** num_elevators)` like `FlattenActionWrapper`, for DQN.
+    With `compact_obs=True` the observations are integer counts like
+    `SingleAgentElevatorEnv(compact_obs=True)`. `action_masks()` gives the valid per-car
+    actions of all sub-environments at once, for sb3-contrib's `MaskablePPO`.
+    """
+
+    def __init__(self, num_envs, sim_step_size=1.0, flatten_actions=False, seed=None, config=None, compact_obs=False):
+        self.render_mode = None
+        self.config = SimConfig.coerce(config)
+        self.building = VectorBuilding(num_envs, **self.config.vector_building_kwargs(), sim_step_size=sim_step_size, seed=seed)
+        self.obs_writer = VectorObservationWriter(self.building, compact=compact_obs)
+
+        self.num_floors = self.building.num_floors
+        self.num_elevators = self.building.num_elevators
+        self.nvec = np.full(self.num_elevators, 3)
+        self.flatten_actions = flatten_actions
+
+        dtype = self.obs_writer.dtype
+        if compact_obs:
+            observation_space = spaces.Box(low=0, high=np.iinfo(dtype).max, shape=(self.obs_writer.size,), dtype=dtype)
+        else:
+            observation_space = spaces.Box(low=-np.inf, high=np.inf, shape=(self.obs_writer.size,), dtype=np.float32)
+        if flatten_actions:
+            action_space = spaces.Discrete(int(self.nvec.prod()))
+        else:
+            action_space = spaces.MultiDiscrete(self.nvec)
+        super().__init__(num_envs, observation_space, action_space)
+
+        # Two observation buffers, alternated so the previous batch stays valid while SB3 stores it
+        self._obs_buffers = np.zeros((2, num_envs, self.obs_writer.size), dtype=dtype)
+        self._current = 0
+        self._actions = None
+
+    def _write_obs(self):
+        self._current ^= 1
+        return self.obs_writer.write(self._obs_buffers[self._current])
+
+    def reset(self):
+        self.building.reset()
+        self.reset_infos = [{} for _ in range(self.num_envs)]
+        return self._write_obs()
+
+    def step_async(self, actions):
+        actions = np.asarray(actions)
+        if self.flatten_actions:
+            actions = np.stack(np.unravel_index(actions.reshape(self.num_envs), self.nvec), axis=1)
+        self._actions = actions.reshape(self.num_envs, self.num_elevators)
+
+    def step_wait(self):
+        update_infos, dones = self.building.step(self._actions)
+
+        num_waiting = self.building.num_waiting()
+        num_passengers = update_infos['num_passengers']
+        busy = (num_waiting > 0)[:, None] | (num_passengers > 0)
+        car_rewards = (
+            -1.0 * (update_infos['is_idle'] & busy)
+            + 50.0 * update_infos['passengers_dropped_off']
+            + 10.0 * update_infos['passengers_picked_up']
+            - 0.05 * num_passengers
+        )
+        rewards = (car_rewards.sum(axis=1) - 0.05 * num_waiting).astype(np.float32)
+
+        obs = self._write_obs()
+        infos = [{} for _ in range(self.num_envs)]
+
+        done_envs = np.flatnonzero(dones)
+        if done_envs.size:
+            delivered = self.building.delivered_people_count[done_envs]
+            total_wait = self.building.total_wait_time[done_envs]
+            total_travel = self.building.total_travel_time[done_envs]
+            for i, env_idx in enumerate(done_envs.tolist()):
+                infos[env_idx] = {
+                    "delivered": int(delivered[i]),
+                    "avg_wait": total_wait[i] / delivered[i],
+                    "avg_pickup_wait_time": (total_wait[i] - total_travel[i]) / delivered[i],
+                    "avg_travel_time": total_travel[i] / delivered[i],
+                    "terminal_observation": obs[env_idx].copy(),
+                    "TimeLimit.truncated": False,
+                }
+            self.building.reset(dones)
+            self.obs_writer.write(obs)
+
+        return obs, rewards, dones.copy(), infos
+
+    def action_masks(self):
+        """Valid actions as a `[num_envs, num_elevators * 3]` bool array, from the car floors."""
+        return action_mask(self.building.floor, self.num_floors).reshape(self.num_envs, -1)
+
+    def seed(self, seed=None):
+        self.building.rng = np.random.default_rng(seed)
+        return [seed] * self.num_envs
+
+    def close(self):
+        pass
+
+    def get_images(self):
+        return []
+
+    def _indices(self, indices):
+        if indices is None:
+            return range(self.num_envs)
+        if isinstance(indices, int):
+            return [indices]
+        return indices
+
+    def _all_indices(self, indices, what):
+        # Attributes and methods belong to the one batched env, shared by every sub-env
+        indices = self._indices(indices)
+        if set(indices) != set(range(self.num_envs)):
+            raise ValueError(f"{type(self).__name__} cannot {what} for a subset of its sub-environments")
+        return indices
+
+    def get_attr(self, attr_name, indices=None):
+        # The same value for every sub-env, one entry per index
+        value = getattr(self, attr_name)
+        return [value] * len(self._indices(indices))
+
+    def set_attr(self, attr_name, value, indices=None):
+        self._all_indices(indices, f"set '{attr_name}'")
+        setattr(self, attr_name, value)
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        if method_name == "action_masks":
+            # Computed for all sub-envs in one call, handed out per sub-env
+            return list(self.action_masks()[list(self._indices(indices))])
+        indices = self._all_indices(indices, f"call '{method_name}'")
+        result = getattr(self, method_name)(*method_args, **method_kwargs)
+        return [result] * len(indices)
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False for _ in self._indices(indices)]
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The modules live at the repository root, in single_agent/ and marl/, imported by bare name like the scripts do
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT, os.path.join(ROOT, "single_agent"), os.path.join(ROOT, "marl")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("ray")
+pytest.importorskip("torch")
+
+from ray.rllib.algorithms.ppo import PPOConfig
+from ray.rllib.policy.policy import PolicySpec
+from ray.tune.registry import register_env
+
+from batched_eval import POLICY_ID, run_episodes, shared_policy_fn
+from multi_agent_env import MARLElevatorEnv
+from rllib_env import ElevatorMultiAgentEnv
+from sim_config import SimConfig
+
+CONFIG = SimConfig(
+    num_floors=8, num_elevators=3, elevator_capacity=6, spawn_weight=[5, 1, 1.5, 2, 1, 3, 6],
+    need_to_carry=20, day_delay=100, elevator_delay=0.5,
+)
+
+
+def _build(new_api_stack):
+    register_env("marl_elevator_test", lambda env_config: ElevatorMultiAgentEnv(env_config))
+    env = MARLElevatorEnv(config=CONFIG)
+    agent = env.possible_agents[0]
+    spec = PolicySpec(observation_space=env.observation_space(agent), action_space=env.action_space(agent))
+    env.close()
+
+    config = (
+        PPOConfig()
+        .api_stack(enable_rl_module_and_learner=new_api_stack, enable_env_runner_and_connector_v2=new_api_stack)
+        .environment("marl_elevator_test", env_config={"sim_step_size": 1.0, "config": CONFIG}, disable_env_checking=True)
+        .framework("torch")
+        .env_runners(num_env_runners=0)
+        .multi_agent(
+            policies={POLICY_ID: spec},
+            policy_mapping_fn=(lambda agent_id, episode, **kwargs: POLICY_ID),
+        )
+    )
+    return config.build()
+
+
+@pytest.mark.parametrize("new_api_stack", [True, False], ids=["rl_module", "policy"])
+def test_shared_policy_fn_on_both_api_stacks(new_api_stack):
+    algo = _build(new_api_stack)
+    try:
+        policy_fn = shared_policy_fn(algo)
+        env = MARLElevatorEnv(config=CONFIG)
+        obs, _ = env.reset(seed=0)
+        obs_batch = np.stack([obs[agent] for agent in env.possible_agents]).astype(np.float32)
+        env.close()
+
+        actions = policy_fn(obs_batch)
+        assert actions.shape == (CONFIG.num_elevators,)
+        assert np.isin(actions, [0, 1, 2]).all()
+
+        results, summary = run_episodes(policy_fn, num_episodes=2, num_envs=2, config=CONFIG, max_steps=50)
+        assert len(results) == 2
+        assert summary["steps"] > 0
+    finally:
+        algo.stop()
@@ -0,0 +1,68 @@
+import numpy as np
+
+from sim_config import SimConfig
+from single_agent_env import SingleAgentElevatorEnv
+
+CONFIG = SimConfig(
+    num_floors=8, num_elevators=3, elevator_capacity=6, spawn_weight=[5, 1, 1.5, 2, 1, 3, 6],
+    need_to_carry=10_000, day_delay=100, elevator_delay=0.5,
+)
+
+
+class ScriptedArrivals:
+    """
+    Arrival process handing out a fixed list of (time, origin, destination) arrivals.
+    """
+
+    def __init__(self, num_floors, arrivals):
+        self.num_floors = num_floors
+        self.arrivals = sorted(arrivals)
+        self.reset()
+
+    def reset(self):
+        self.position = 0
+
+    def get_state(self):
+        return self.position
+
+    def set_state(self, state):
+        self.position = state
+
+    def pop_until(self, time):
+        end = self.position
+        while end < len(self.arrivals) and self.arrivals[end][0] <= time:
+            end += 1
+        batch = self.arrivals[self.position:end]
+        self.position = end
+        times, origins, destinations = zip(*batch) if batch else ((), (), ())
+        return np.array(times, dtype=np.float64), np.array(origins, dtype=np.int64), np.array(destinations, dtype=np.int64)
+
+    def next_time(self):
+        return self.arrivals[self.position][0] if self.position < len(self.arrivals) else float("inf")
+
+
+def _env(arrivals):
+    env = SingleAgentElevatorEnv(config=CONFIG, decision_interval=10)
+    env.building.arrivals = ScriptedArrivals(CONFIG.num_floors, arrivals)
+    env.reset()
+    return env
+
+
+def test_interval_runs_to_the_limit_without_events():
+    env = _env([])
+    _, _, _, _, info = env.step(np.zeros(CONFIG.num_elevators, dtype=np.int64))
+    assert info["ticks"] == 10
+
+
+def test_arrival_ends_interval_when_a_pickup_hides_it():
+    # Idle cars wait at floor 0. One person is already waiting there and boards in the
+    # first tick, while another arrives on floor 5 in that same tick: the waiting count
+    # does not change, but the arrival is still a decision point.
+    env = _env([(0.0, 5, 2)])
+    env.building.add_waiting_person(0, 3, 0.0)
+    num_waiting = env.building.num_waiting
+
+    _, _, _, _, info = env.step(np.zeros(CONFIG.num_elevators, dtype=np.int64))
+    assert env.building.num_waiting == num_waiting
+    assert sum(len(elevator.passengers) for elevator in env.building.elevators) == 1
+    assert info["ticks"] == 1
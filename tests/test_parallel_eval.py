@@ -0,0 +1,31 @@
+import functools
+
+from parallel_eval import EvalJob, Scenario, run_job
+from rollout_dispatcher import RolloutDispatcher
+from sim_config import SimConfig
+
+CONFIG = SimConfig(
+    num_floors=8, num_elevators=3, elevator_capacity=6, spawn_weight=[5, 1, 1.5, 2, 1, 3, 6],
+    need_to_carry=10_000, day_delay=100, elevator_delay=0.5,
+)
+
+
+def _row(job):
+    row = run_job(job)
+    del row["wall_time"]
+    return row
+
+
+def test_rule_based_job_does_not_depend_on_earlier_jobs():
+    # No time budget, so the dispatcher's choices depend only on its seed
+    agent = {
+        "name": "Rollout",
+        "model_loader": functools.partial(RolloutDispatcher, time_budget=float("inf"), horizon=3, num_samples=2),
+        "model_path": None, "env_wrapper": None, "eval_params": {},
+    }
+    scenario = Scenario("default", CONFIG, max_steps=150)
+
+    alone = _row(EvalJob(agent, scenario, seed=0))
+    _row(EvalJob(agent, scenario, seed=1))
+    after_other_job = _row(EvalJob(agent, scenario, seed=0))
+    assert after_other_job == alone
@@ -0,0 +1,82 @@
+import random
+
+import numpy as np
+import pytest
+
+from arrivals import PoissonArrivals
+from sim_config import SimConfig
+from single_agent_env import SingleAgentElevatorEnv
+
+CONFIG = SimConfig(
+    num_floors=8, num_elevators=3, elevator_capacity=6, spawn_weight=[5, 1, 1.5, 2, 1, 3, 6],
+    need_to_carry=10_000, day_delay=100, elevator_delay=0.5,
+)
+
+
+def _same_snapshot(a, b):
+    # The arrival process state holds NumPy arrays, the rest compares as plain tuples
+    assert a._replace(arrivals_state=None) == b._replace(arrivals_state=None)
+    if a.arrivals_state is None or b.arrivals_state is None:
+        assert a.arrivals_state is b.arrivals_state
+        return
+    assert len(a.arrivals_state) == len(b.arrivals_state)
+    for x, y in zip(a.arrivals_state, b.arrivals_state):
+        if isinstance(x, np.ndarray):
+            np.testing.assert_array_equal(x, y)
+        else:
+            assert x == y
+
+
+def _run(env, actions):
+    """Steps `env` through `actions`; returns the rewards, observations and snapshots after every step."""
+    trace = []
+    for action in actions:
+        obs, reward, done, _, info = env.step(action)
+        assert not done
+        trace.append((reward, obs.copy(), info, env.building.snapshot()))
+    return trace
+
+
+@pytest.mark.parametrize("with_arrivals", [False, True])
+def test_restored_building_steps_identically(with_arrivals):
+    random.seed(0)
+    env = SingleAgentElevatorEnv(config=CONFIG)
+    if with_arrivals:
+        env.building.arrivals = PoissonArrivals.from_spawn_weight(
+            CONFIG.num_floors, CONFIG.spawn_weight, CONFIG.day_delay, seed=1,
+        )
+    env.reset()
+
+    # Idle, up and down moves, so cars travel, board and alight before and after the snapshot
+    rng = np.random.default_rng(2)
+    _run(env, rng.integers(3, size=(300, CONFIG.num_elevators)))
+    snap = env.building.snapshot()
+
+    actions = rng.integers(3, size=(200, CONFIG.num_elevators))
+    first = _run(env, actions)
+    env.building.restore(snap)
+    _same_snapshot(env.building.snapshot(), snap)
+    second = _run(env, actions)
+
+    assert sum(reward for reward, *_ in first) != 0
+    for (reward_a, obs_a, info_a, snap_a), (reward_b, obs_b, info_b, snap_b) in zip(first, second):
+        assert reward_a == reward_b
+        np.testing.assert_array_equal(obs_a, obs_b)
+        assert info_a == info_b
+        _same_snapshot(snap_a, snap_b)
+
+
+def test_snapshot_can_be_restored_repeatedly():
+    random.seed(3)
+    env = SingleAgentElevatorEnv(config=CONFIG)
+    env.reset()
+    rng = np.random.default_rng(4)
+    _run(env, rng.integers(3, size=(100, CONFIG.num_elevators)))
+    snap = env.building.snapshot()
+
+    actions = rng.integers(3, size=(50, CONFIG.num_elevators))
+    runs = []
+    for _ in range(3):
+        env.building.restore(snap)
+        runs.append([reward for reward, *_ in _run(env, actions)])
+    assert runs[0] == runs[1] == runs[2]
@@ -0,0 +1,35 @@
+import random
+
+import numpy as np
+
+from building import Building
+from normal_algorithm import NormalAlgorithm, VectorNormalAlgorithm, stack_building_state
+from sim_config import SimConfig
+
+CONFIG = SimConfig(
+    num_floors=8, num_elevators=3, elevator_capacity=6, spawn_weight=[5, 1, 1.5, 2, 1, 3, 6],
+    need_to_carry=10_000, day_delay=100, elevator_delay=0.5,
+)
+
+
+def test_vector_actions_match_per_building_predict():
+    random.seed(0)
+    buildings = [Building(**CONFIG.building_kwargs(), sim_step_size=1.0) for _ in range(6)]
+    for building in buildings:
+        building.reset()
+
+    scalar = NormalAlgorithm()
+    vector = VectorNormalAlgorithm()
+    rng = np.random.default_rng(1)
+    # Random actions push the cars into states the greedy policy alone never reaches
+    random_rate = np.linspace(0.0, 1.0, len(buildings))
+
+    for _ in range(500):
+        expected = np.stack([scalar.predict(building) for building in buildings])
+        actions = vector.actions(*stack_building_state(buildings))
+        np.testing.assert_array_equal(actions, expected)
+
+        for building, greedy, rate in zip(buildings, expected, random_rate):
+            explore = rng.random(CONFIG.num_elevators) < rate
+            _, _, done, _ = building.step(np.where(explore, rng.integers(3, size=CONFIG.num_elevators), greedy))
+            assert not done
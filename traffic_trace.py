@@ -0,0 +1,157 @@
+import copy
+
+import numpy as np
+
+# File layout: header, day index (num_days + 1 record offsets), then fixed-width records sorted by time.
+TRACE_MAGIC = b'ELVTRACE'
+TRACE_VERSION = 1
+
+HEADER_DTYPE = np.dtype([
+    ('magic', 'S8'),
+    ('version', '<u4'),
+    ('num_floors', '<u4'),
+    ('num_records', '<u8'),
+    ('num_days', '<u8'),
+    ('day_length', '<f8'),
+])
+RECORD_DTYPE = np.dtype([
+    ('time', '<f8'),
+    ('origin', '<u2'),
+    ('destination', '<u2'),
+])
+
+
+def write_trace(path, times, origins, destinations, num_floors: int, day_length: float) -> None:
+    """
+    Writes recorded arrivals (spawn time, origin floor, destination floor) as a binary trace file.
+    Day `d` covers times in [d * day_length, (d + 1) * day_length).
+    Every record must name two different floors in [0, num_floors).
+    """
+    times = np.asarray(times, dtype=np.float64)
+    origins = np.asarray(origins)
+    destinations = np.asarray(destinations)
+    if not (len(times) == len(origins) == len(destinations)):
+        raise ValueError("times, origins and destinations must have the same length")
+    if len(times) and (times.min() < 0 or min(origins.min(), destinations.min()) < 0
+                       or max(origins.max(), destinations.max()) >= num_floors):
+        raise ValueError("Trace records must have non-negative times and floors in [0, num_floors)")
+    same_floor = np.flatnonzero(origins == destinations)
+    if len(same_floor):
+        raise ValueError(f"{len(same_floor)} trace records have the same origin and destination "
+                         f"(first at index {same_floor[0]})")
+
+    order = np.argsort(times, kind='stable')
+    records = np.empty(len(times), dtype=RECORD_DTYPE)
+    records['time'] = times[order]
+    records['origin'] = origins[order]
+    records['destination'] = destinations[order]
+
+    num_days = int(records['time'][-1] // day_length) + 1 if len(records) else 0
+    day_index = np.searchsorted(records['time'], np.arange(num_days + 1) * day_length).astype('<u8')
+
+    header = np.zeros(1, dtype=HEADER_DTYPE)
+    header['magic'] = TRACE_MAGIC
+    header['version'] = TRACE_VERSION
+    header['num_floors'] = num_floors
+    header['num_records'] = len(records)
+    header['num_days'] = num_days
+    header['day_length'] = day_length
+
+    with open(path, 'wb') as f:
+        header.tofile(f)
+        day_index.tofile(f)
+        records.tofile(f)
+
+
+class TraceSpawner:
+    """
+    Replays a binary trace file written by `write_trace` as a `Building` arrival process
+    (`Building(..., arrivals=TraceSpawner(path))`).
+
+    Records are read through `numpy.memmap`, so only the pages around the replay
+    position are loaded and worker processes replaying the same file share the page cache.
+    Episode time 0 maps to the start of `start_day`; the trace ends after its last record.
+    With `num_floors`, the trace must have been recorded for that many floors; `Building`
+    also checks this when the spawner is attached.
+    """
+    WINDOW = 1024
+
+    def __init__(self, path, start_day: int = 0, num_floors: int | None = None):
+
+        header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+        if len(header) == 0 or header['magic'][0] != TRACE_MAGIC:
+            raise ValueError(f"{path} is not an elevator trace file")
+        if header['version'][0] != TRACE_VERSION:
+            raise ValueError(f"Unsupported trace version {header['version'][0]} in {path}")
+
+        self.path = path
+        self.num_floors = int(header['num_floors'][0])
+        self.num_records = int(header['num_records'][0])
+        self.num_days = int(header['num_days'][0])
+        self.day_length = float(header['day_length'][0])
+        if num_floors is not None and num_floors != self.num_floors:
+            raise ValueError(f"{path} was recorded for {self.num_floors} floors, not {num_floors}")
+
+        self.day_index = np.memmap(path, dtype='<u8', mode='r', offset=HEADER_DTYPE.itemsize, shape=(self.num_days + 1,))
+        records_offset = HEADER_DTYPE.itemsize + self.day_index.nbytes
+        self.records = np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=records_offset, shape=(self.num_records,))
+
+        if not 0 <= start_day <= self.num_days:
+            raise ValueError(f"start_day must be in [0, {self.num_days}], got {start_day}")
+        self.start_day = start_day
+        self.reset()
+
+    def reset(self):
+        """
+        Rewinds the replay to the start of `start_day`.
+        """
+        self.position = int(self.day_index[self.start_day])
+        self.time_offset = self.start_day * self.day_length
+
+    def get_state(self):
+        """
+        State for `Building.snapshot`: the replay position.
+        """
+        return self.position
+
+    def set_state(self, state):
+        self.position = state
+
+    def fork(self, seed=None):
+        """
+        Copy at the current replay position for lookahead. A recorded trace has no randomness,
+        so `seed` is ignored and the copy replays the same upcoming records.
+        """
+        return copy.copy(self)
+
+    def _end_of(self, time) -> int:
+        """
+        Index of the first record after `time` (episode time), scanning forward in small windows.
+        """
+        trace_time = time + self.time_offset
+        end = self.position
+        while end < self.num_records:
+            window = self.records['time'][end:end + self.WINDOW]
+            found = np.searchsorted(window, trace_time, side='right')
+            end += found
+            if found < len(window):
+                break
+        return end
+
+    def pop_until(self, time):
+        """
+        Returns the (times, origins, destinations) arrays of every record not
+        handed out yet whose episode time is <= `time`.
+        """
+        end = self._end_of(time)
+        batch = np.array(self.records[self.position:end])
+        self.position = end
+        return batch['time'] - self.time_offset, batch['origin'].astype(np.int64), batch['destination'].astype(np.int64)
+
+    def next_time(self) -> float:
+        """
+        Episode time of the next record not handed out yet (inf once the trace is exhausted).
+        """
+        if self.position >= self.num_records:
+            return float('inf')
+        return float(self.records['time'][self.position]) - self.time_offset
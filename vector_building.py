@@ -0,0 +1,297 @@
+import numpy as np
+
+
+class VectorBuilding:
+    """
+    Struct-of-arrays version of `Building` that advances `num_envs` independent
+    buildings with a single vectorized `step(actions[N, E])` call.
+
+    Elevator floors, directions, move timers and passengers live in NumPy arrays
+    instead of `Elevator`/`Person` objects. The per-tick rules are the same as
+    `Building.step` + `Elevator.update`: move timers, drop_off, direction-aware
+    pick_up in arrival order, capacity and seasonality spawning.
+    """
+
+    def __init__(
+            self,
+            num_envs: int,
+            num_floors: int,
+            num_elevators: int,
+            elevator_capacity: int,
+            spawn_weight: list[float],
+            need_to_carry: int = 50,
+            day_delay: float = 10,
+            elevator_delay: float = 0.1,
+            sim_step_size: float = 0.01,
+            max_waiting: int = 256,
+            seed: int | None = None
+    ):
+
+        self.num_envs = num_envs
+        self.num_floors = num_floors
+        self.num_elevators = num_elevators
+        self.elevator_capacity = elevator_capacity
+        self.elevator_delay = elevator_delay
+
+        self.need_to_carry = need_to_carry
+
+        self.spawn_weight = np.asarray(spawn_weight, dtype=np.float64)
+        self.day_delay = day_delay
+        self.sim_step_size = sim_step_size
+
+        self.rng = np.random.default_rng(seed)
+
+        N, E, C, P = num_envs, num_elevators, elevator_capacity, max_waiting
+
+        # Per-building clocks
+        self.sim_time = np.zeros(N)
+        self.last_spawn_time = np.zeros(N)
+        self.day_timer = np.zeros(N)
+        self.current_day = np.ones(N, dtype=np.int64)
+
+        # Per-car state
+        self.floor = np.zeros((N, E), dtype=np.int64)
+        self.direction = np.zeros((N, E), dtype=np.int64)
+        self.run_timer = np.zeros((N, E))
+
+        # Passengers inside each car, in boarding order (-1 marks an empty slot)
+        self.num_passengers = np.zeros((N, E), dtype=np.int64)
+        self.car_dest = np.full((N, E, C), -1, dtype=np.int64)
+        self.car_spawn_time = np.zeros((N, E, C))
+        self.car_board_time = np.zeros((N, E, C))
+
+        # Waiting people of each building, slots kept in arrival order
+        self.wait_active = np.zeros((N, P), dtype=bool)
+        self.wait_origin = np.zeros((N, P), dtype=np.int64)
+        self.wait_dest = np.zeros((N, P), dtype=np.int64)
+        self.wait_spawn_time = np.zeros((N, P))
+        self.wait_tail = np.zeros(N, dtype=np.int64)
+
+        self.delivered_people_count = np.zeros(N, dtype=np.int64)
+        self.total_wait_time = np.zeros(N)
+        self.total_travel_time = np.zeros(N)
+
+    @property
+    def total_pickup_wait_time(self):
+        return self.total_wait_time - self.total_travel_time
+
+    def reset(self, mask=None):
+        """
+        Resets every building, or only the ones selected by the boolean `mask`.
+        """
+        if mask is None:
+            mask = np.ones(self.num_envs, dtype=bool)
+        mask = np.asarray(mask, dtype=bool)
+
+        self.sim_time[mask] = 0.0
+        self.last_spawn_time[mask] = 0.0
+        self.day_timer[mask] = 0.0
+        self.current_day[mask] = 1
+
+        self.floor[mask] = 0
+        self.direction[mask] = 0
+        self.run_timer[mask] = 0.0
+
+        self.num_passengers[mask] = 0
+        self.car_dest[mask] = -1
+        self.car_spawn_time[mask] = 0.0
+        self.car_board_time[mask] = 0.0
+
+        self.wait_active[mask] = False
+        self.wait_tail[mask] = 0
+
+        self.delivered_people_count[mask] = 0
+        self.total_wait_time[mask] = 0.0
+        self.total_travel_time[mask] = 0.0
+
+    def hall_calls(self):
+        """
+        Returns the number of people waiting to go up and down on every floor,
+        as two `[num_envs, num_floors]` arrays.
+        """
+        N, F = self.num_envs, self.num_floors
+        width = self.wait_tail.max()
+        origin = self.wait_origin[:, :width]
+        dest = self.wait_dest[:, :width]
+        active = self.wait_active[:, :width]
+        offset = np.arange(N)[:, None] * F + origin
+        going_up = active & (dest > origin)
+        going_down = active & (dest < origin)
+        up = np.bincount(offset[going_up], minlength=N * F).reshape(N, F)
+        down = np.bincount(offset[going_down], minlength=N * F).reshape(N, F)
+        return up, down
+
+    def passenger_counts(self):
+        """
+        Returns the per-destination passenger histogram of every car,
+        as a `[num_envs, num_elevators, num_floors]` array.
+        """
+        N, E, F = self.num_envs, self.num_elevators, self.num_floors
+        onboard = self.car_dest >= 0
+        offset = (np.arange(N * E).reshape(N, E, 1) * F) + self.car_dest
+        counts = np.bincount(offset[onboard], minlength=N * E * F)
+        return counts.reshape(N, E, F)
+
+    def num_waiting(self):
+        return self.wait_active[:, :self.wait_tail.max()].sum(axis=1)
+
+    def _drop_off(self):
+        """
+        Lets passengers out of every car that stands at their destination.
+        Returns the `[N, E]` array of dropped off counts.
+        """
+        alight = self.car_dest == self.floor[..., None]
+        dropped = alight.sum(axis=2)
+        if not dropped.any():
+            return dropped
+
+        now = self.sim_time[:, None, None]
+        self.total_wait_time += np.where(alight, now - self.car_spawn_time, 0.0).sum(axis=(1, 2))
+        self.total_travel_time += np.where(alight, now - self.car_board_time, 0.0).sum(axis=(1, 2))
+        self.delivered_people_count += dropped.sum(axis=1)
+        self.num_passengers -= dropped
+
+        # Close the gaps so the remaining passengers keep their boarding order
+        self.car_dest[alight] = -1
+        order = np.argsort(self.car_dest < 0, axis=2, kind='stable')
+        self.car_dest = np.take_along_axis(self.car_dest, order, axis=2)
+        self.car_spawn_time = np.take_along_axis(self.car_spawn_time, order, axis=2)
+        self.car_board_time = np.take_along_axis(self.car_board_time, order, axis=2)
+
+        return dropped
+
+    def _pick_up(self, e):
+        """
+        Boards waiting people into car `e` of every building.
+        Returns the `[N]` array of picked up counts.
+        """
+        picked_up = np.zeros(self.num_envs, dtype=np.int64)
+
+        # Only the used part of the pool and the buildings with someone at the car's floor matter
+        width = self.wait_tail.max()
+        floor = self.floor[:, e]
+        at_floor = self.wait_active[:, :width] & (self.wait_origin[:, :width] == floor[:, None])
+        envs = np.flatnonzero(at_floor.any(axis=1))
+        if envs.size == 0:
+            return picked_up
+        at_floor = at_floor[envs]
+        floor = floor[envs]
+
+        # An idle car with passengers heads towards its first passenger's destination
+        direction = self.direction[envs, e]
+        set_direction = (direction == 0) & (self.num_passengers[envs, e] > 0)
+        direction = np.where(set_direction, np.sign(self.car_dest[envs, e, 0] - floor), direction)
+        self.direction[envs, e] = direction
+
+        person_direction = np.sign(self.wait_dest[envs, :width] - floor[:, None])
+        eligible = at_floor & ((direction[:, None] == 0) | (person_direction == direction[:, None]))
+
+        rank = np.cumsum(eligible, axis=1, dtype=np.int32)
+        free = self.elevator_capacity - self.num_passengers[envs, e]
+        board = eligible & (rank <= free[:, None])
+
+        rows, slots = np.nonzero(board)
+        boarding_envs = envs[rows]
+        positions = self.num_passengers[boarding_envs, e] + rank[rows, slots] - 1
+        self.car_dest[boarding_envs, e, positions] = self.wait_dest[boarding_envs, slots]
+        self.car_spawn_time[boarding_envs, e, positions] = self.wait_spawn_time[boarding_envs, slots]
+        self.car_board_time[boarding_envs, e, positions] = self.sim_time[boarding_envs]
+        self.wait_active[boarding_envs, slots] = False
+
+        picked_up[envs] = board.sum(axis=1)
+        self.num_passengers[:, e] += picked_up
+        return picked_up
+
+    def _compact_waiting(self, rows):
+        """
+        Moves the active waiting slots of the selected buildings to the front,
+        keeping arrival order, and grows the pool when a building is full.
+        """
+        order = np.argsort(~self.wait_active[rows], axis=1, kind='stable')
+        for name in ('wait_active', 'wait_origin', 'wait_dest', 'wait_spawn_time'):
+            array = getattr(self, name)
+            array[rows] = np.take_along_axis(array[rows], order, axis=1)
+        self.wait_tail[rows] = self.wait_active[rows].sum(axis=1)
+
+        if (self.wait_tail == self.wait_active.shape[1]).any():
+            extra = self.wait_active.shape[1]
+            self.wait_active = np.pad(self.wait_active, ((0, 0), (0, extra)))
+            self.wait_origin = np.pad(self.wait_origin, ((0, 0), (0, extra)))
+            self.wait_dest = np.pad(self.wait_dest, ((0, 0), (0, extra)))
+            self.wait_spawn_time = np.pad(self.wait_spawn_time, ((0, 0), (0, extra)))
+
+    def spawn_people(self, spawn_frequency):
+        """
+        Spawns one person in every building whose spawn interval has elapsed.
+        """
+        spawning = self.sim_time - self.last_spawn_time > spawn_frequency
+        envs = np.flatnonzero(spawning)
+        if envs.size == 0:
+            return
+
+        full = envs[self.wait_tail[envs] == self.wait_active.shape[1]]
+        if full.size:
+            self._compact_waiting(full)
+
+        start_floor = self.rng.integers(0, self.num_floors, size=envs.size)
+        destination_floor = self.rng.integers(0, self.num_floors - 1, size=envs.size)
+        destination_floor += destination_floor >= start_floor
+
+        slots = self.wait_tail[envs]
+        self.wait_active[envs, slots] = True
+        self.wait_origin[envs, slots] = start_floor
+        self.wait_dest[envs, slots] = destination_floor
+        self.wait_spawn_time[envs, slots] = self.sim_time[envs]
+        self.wait_tail[envs] += 1
+
+        self.last_spawn_time[envs] = self.sim_time[envs]
+
+    def seasonality_spawn(self):
+        self.spawn_people(self.spawn_weight[self.current_day])
+
+        rollover = self.sim_time - self.day_timer > self.day_delay
+        self.day_timer = np.where(rollover, self.sim_time, self.day_timer)
+        self.current_day = np.where(rollover, (self.current_day + 1) % 7, self.current_day)
+
+    def step(self, actions):
+        """
+        Advances every building by one tick.
+
+        `actions` is a `[num_envs, num_elevators]` array of 0 (idle), 1 (up), 2 (down).
+        Returns a dict of `[num_envs, num_elevators]` arrays with the same keys as
+        `Elevator.update` infos, and the `[num_envs]` done flags.
+        """
+        actions = np.asarray(actions).reshape(self.num_envs, self.num_elevators)
+
+        ready = self.sim_time[:, None] - self.run_timer > self.elevator_delay
+        up = (actions == 1) & (self.floor < self.num_floors - 1) & ready
+        down = (actions == 2) & (self.floor > 0) & ready
+
+        self.floor += up
+        self.floor -= down
+        self.run_timer = np.where(up | down, self.sim_time[:, None], self.run_timer)
+        self.direction[up] = 1
+        self.direction[down] = -1
+        self.direction[actions == 0] = 0
+
+        dropped_off = self._drop_off()
+
+        # Cars share the floor queues, so boarding runs car by car like Building.step
+        picked_up = np.empty_like(dropped_off)
+        for e in range(self.num_elevators):
+            picked_up[:, e] = self._pick_up(e)
+
+        self.seasonality_spawn()
+
+        self.sim_time += self.sim_step_size
+
+        update_infos = {
+            'action': actions,
+            'passengers_dropped_off': dropped_off,
+            'passengers_picked_up': picked_up,
+            'is_idle': actions == 0,
+            'num_passengers': self.num_passengers.copy(),
+        }
+        done = self.delivered_people_count >= self.need_to_carry
+
+        return update_infos, done
@@ -6,11 +6,7 @@ class PersonView:
         self.font = font
 
     def draw(self, screen, person, x, y):
-        color = Color.BLUE
-        if person.is_delivered:
-            color = Color.GRAY
-        elif person.is_in_elevator:
-            color = Color.YELLOW
+        color = Color.YELLOW if person.is_in_elevator else Color.BLUE
         pygame.draw.circle(screen, color, (x , y - 10), 5)
         text = self.font.render(str(person.destination_floor + 1), True, Color.BLACK)
         screen.blit(text, (x , y - 25))
@@ -38,10 +34,11 @@ class ElevatorView:
         screen.blit(text_surface, (x, y - 20))
 
 class BuildingView:
-    def __init__(self, building, screen, font):
+    def __init__(self, building, screen, font, flip=True):
         self.building = building
         self.screen = screen
         self.font = font
+        self.flip = flip  # False when drawing to an off-screen surface
         self.elevator_view = ElevatorView(font)
         self.person_view = PersonView(font)
 
@@ -84,4 +81,5 @@ class BuildingView:
         text_surface = self.font.render(info_text, True, Color.BLACK)
         self.screen.blit(text_surface, (10, self.screen.get_height() - 30))
 
-        pygame.display.flip()
+        if self.flip:
+            pygame.display.flip()